@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Command line of the benchmarks:
+
+    python -m benchmarks generate DIRECTORY
+    python -m benchmarks run [-o RESULTS.json]
+    python -m benchmarks compare OLD.json NEW.json
+"""
+
+__author__ = 'Nb'
+
+import argparse
+import json
+import sys
+
+from .corpus import SHAPES, SIZES, write_corpus
+from .run import OPERATIONS, run
+from .compare import compare, format_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[-1].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_command = commands.add_parser('generate', help='write the corpus to a directory')
+    generate_command.add_argument('directory')
+
+    run_command = commands.add_parser('run', help='time LaJSON and json on the corpus')
+    run_command.add_argument('-o', '--output', help='file to write the results to as JSON')
+    run_command.add_argument('--repeat', type=int, default=5)
+    run_command.add_argument('--min-time', type=float, default=0.05,
+                             help='seconds of calls in a row for each timing')
+    run_command.add_argument('--operations', nargs='+', choices=list(OPERATIONS))
+
+    for command in [generate_command, run_command]:
+        command.add_argument('--shapes', nargs='+', choices=list(SHAPES))
+        command.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+
+    compare_command = commands.add_parser('compare', help='flag regressions between two runs')
+    compare_command.add_argument('old')
+    compare_command.add_argument('new')
+    compare_command.add_argument('--threshold', type=float, default=0.1,
+                                 help='relative slowdown flagged as a regression')
+
+    arguments = parser.parse_args(argv)
+    if arguments.command == 'generate':
+        write_corpus(arguments.directory, arguments.shapes, arguments.sizes)
+    elif arguments.command == 'run':
+        results = run(arguments.shapes, arguments.sizes, arguments.operations, arguments.repeat,
+                      arguments.min_time, log=print)
+        if arguments.output:
+            with open(arguments.output, 'w') as f:
+                json.dump(results, f, indent=2)
+    else:
+        with open(arguments.old) as f:
+            old = json.load(f)
+        with open(arguments.new) as f:
+            new = json.load(f)
+        rows = compare(old, new, arguments.threshold)
+        print(format_rows(rows))
+        if any(flag == 'regression' for _, _, _, _, flag in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
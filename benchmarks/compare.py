@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Comparison of two runs of the benchmarks.
+"""
+
+__author__ = 'Nb'
+
+
+def compare(old, new, threshold=0.1):
+    """
+    Compare the best timings of the benchmarks found in both runs.
+
+    :param old: results of the baseline run, see run.run
+    :param new: results of the run being checked
+    :param threshold: relative slowdown above which a
+        benchmark is flagged as a regression
+    :return: list of (key, old seconds, new seconds, ratio, flag)
+        sorted by key, flag being regression, improvement or an
+        empty string
+    """
+    rows = []
+    old_results, new_results = old['results'], new['results']
+    for key in sorted(old_results.keys() & new_results.keys()):
+        old_best, new_best = old_results[key]['best'], new_results[key]['best']
+        ratio = new_best / old_best
+        if ratio > 1 + threshold:
+            flag = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            flag = 'improvement'
+        else:
+            flag = ''
+        rows.append((key, old_best, new_best, ratio, flag))
+    return rows
+
+
+def format_rows(rows):
+    """Format the rows of a comparison as a table."""
+    lines = ['%-40s %12s %12s %8s' % ('benchmark', 'old', 'new', 'ratio')]
+    for key, old_best, new_best, ratio, flag in rows:
+        lines.append('%-40s %11.6fs %11.6fs %7.2fx %s' % (key, old_best, new_best, ratio, flag))
+    return '\n'.join(lines)
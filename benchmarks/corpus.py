@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Generator of synthetic JSON documents of several shapes and sizes.
+"""
+
+__author__ = 'Nb'
+
+import json
+import os
+import random
+
+# approximate sizes of the documents in chars
+SIZES = {
+    'small': 10000,
+    'medium': 100000,
+    'large': 1000000,
+}
+
+_WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'café', '中文', 'tab\there', 'quote"d',
+          'back\\slash', 'new\nline', '\U0001f600']
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _string_heavy(rng, i):
+    return {'id': str(i), 'title': _text(rng, 8), 'body': _text(rng, 60), 'tags': [_text(rng, 1) for _ in range(4)]}
+
+
+def _number_heavy(rng, i):
+    return [rng.random() * 1000 if n % 2 else rng.randint(-10 ** 9, 10 ** 9) for n in range(32)]
+
+
+def _deep(rng, i):
+    # the stdlib json module recurses and is limited
+    # to about a thousand levels of nesting
+    unit = rng.randint(0, 9)
+    for depth in range(100):
+        unit = {'level': depth, 'next': [unit]} if depth % 2 else [depth, unit]
+    return unit
+
+
+def _wide(rng, i):
+    return 'key_%d_%s' % (i, rng.choice(_WORDS[:5])), rng.choice([rng.random(), i, _text(rng, 2), True, None])
+
+
+def _huge_array(rng, i):
+    return rng.choice([i, rng.random(), _WORDS[i % 5], True, False, None])
+
+
+# each shape is a function creating the i-th unit of a document
+# and whether the units are K-V tuples of a root object
+SHAPES = {
+    'string_heavy': (_string_heavy, False),
+    'number_heavy': (_number_heavy, False),
+    'deep': (_deep, False),
+    'wide': (_wide, True),
+    'huge_array': (_huge_array, False),
+}
+
+
+def generate(shape: str, size: int, seed=0):
+    """
+    Generate a document of shape of about size chars
+    once serialised, the same for the same seed.
+
+    :return: python dict or list
+    """
+    make_unit, is_object = SHAPES[shape]
+    rng = random.Random('%s-%s-%s' % (shape, size, seed))
+    units = []
+    length = 2
+    while length < size:
+        unit = make_unit(rng, len(units))
+        units.append(unit)
+        length += len(json.dumps(dict([unit]) if is_object else unit, ensure_ascii=False)) + (0 if is_object else 2)
+    return dict(units) if is_object else units
+
+
+def iter_corpus(shapes=None, sizes=None, seed=0):
+    """Iterate over (name, source string) of the documents of each shape and size."""
+    for shape in shapes or SHAPES:
+        for size in sizes or ['small', 'medium']:
+            yield '%s-%s' % (shape, size), json.dumps(generate(shape, SIZES[size], seed), ensure_ascii=False)
+
+
+def write_corpus(directory, shapes=None, sizes=None, seed=0):
+    """Write the documents to directory as name.json."""
+    os.makedirs(directory, exist_ok=True)
+    for name, source in iter_corpus(shapes, sizes, seed):
+        with open(os.path.join(directory, name + '.json'), 'w', encoding='utf-8') as f:
+            f.write(source)
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Runners timing LaJSON and the json module on the documents of the corpus.
+"""
+
+__author__ = 'Nb'
+
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import la_json
+from la_json import Parser
+
+from .corpus import iter_corpus
+
+# operations timed on each document, a function creating the timed
+# callable of each library from the source string, or None if the
+# library has no such operation
+OPERATIONS = {
+    'parse': {
+        'la_json': lambda source: lambda: la_json.parse(source),
+        'json': lambda source: lambda: json.loads(source),
+    },
+    'serialise': {
+        'la_json': lambda source: (lambda python: lambda: la_json.serialise(python))(json.loads(source)),
+        'json': lambda source: (lambda python: lambda: json.dumps(python, ensure_ascii=False))(json.loads(source)),
+    },
+    'to_python': {
+        'la_json': lambda source: Parser(source).parse(build_tree=True).to_python,
+        'json': None,
+    },
+    'from_python': {
+        'la_json': lambda source: (lambda python: lambda: Parser.from_python(python))(json.loads(source)),
+        'json': None,
+    },
+}
+
+
+def time_callable(function, repeat=5, min_time=0.05):
+    """
+    Time function, calling it as many times in a row as needed
+    for min_time seconds, and repeat that.
+
+    :return: best and median seconds of a single call,
+        and the number of calls in a row
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return min(times), statistics.median(times), number
+
+
+def run(shapes=None, sizes=None, operations=None, repeat=5, min_time=0.05, log=None):
+    """
+    Time the operations of both libraries on the corpus.
+
+    :param log: function called with a line of progress
+    :return: results as a dict which can be dumped as JSON, its
+        results mapping document/operation/library to the timings
+    """
+    results = {}
+    for name, source in iter_corpus(shapes, sizes):
+        for operation in operations or OPERATIONS:
+            for library, make_callable in OPERATIONS[operation].items():
+                if make_callable is None:
+                    continue
+                best, median, number = time_callable(make_callable(source), repeat, min_time)
+                key = '/'.join([name, operation, library])
+                results[key] = {'best': best, 'median': median, 'number': number, 'chars': len(source)}
+                if log is not None:
+                    log('%-40s %12.6fs %10.2f MB/s' % (key, best, len(source) / best / 1e6))
+    return {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
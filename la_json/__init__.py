@@ -21,13 +21,29 @@ Shortcut to the JSON parser.
 
 __author__ = 'Nb'
 
-from ._parser import Parser
+import codecs
+
+from ._parser import Parser, IncrementalParser, parse_mapped_file
+from ._lazy import lazy_root
+from ._extract import extract_paths
+from ._serialiser import encode, iter_chunks
+from ._lines import iter_records, write_records
+from ._parallel import parse_in_parallel
+from ._intern import InternTable
+from ._stats import ParseStats
+from ._cache import ParseCache, VIEW, COPY
+from ._schema import SchemaParser
+from ._document import Document
+from ._async import feed_async, write_async
+from ._limits import ParseLimits
 from ._util import PY_FLOAT_NAN
 
 
-def parse(source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+def parse(source, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False, workers=1, intern_table=None,
+          numeric_arrays=None, instrument=None, cache=None, limits=None):
     """
-    Parse JSON elements from string.
+    Parse JSON elements from string, or from UTF-8 bytes,
+    bytearray or memoryview without decoding them upfront.
 
     :param allow_nan: when set to True, NaN would
         be converted to convert_nan_to, by default
@@ -36,11 +52,315 @@ def parse(source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=F
     :param allow_inf: when set to True, Inf and
         -Inf would be converted to corresponding
         python floating point number
+    :param workers: number of processes parsing a root
+        array, all cores if None, see parse_in_parallel
+    :param intern_table: InternTable through which repeated
+        keys, short strings, numbers and optionally small
+        subtrees are shared, not used by the workers
+    :param numeric_arrays: when set to array or numpy, arrays
+        of numbers only are converted in bulk to array.array
+        or NumPy arrays, see Parser
+    :param instrument: a ParseStats which the counts and timings
+        of the parse are added to or a function called with them,
+        see Parser, not used by the workers
+    :param cache: ParseCache which the element is looked up in by
+        a digest of source and the options, and added to if it is
+        not there, parses served from it are not instrumented
+    :param limits: ParseLimits checked while scanning, see Parser,
+        the source being parsed in the current process whatever
+        workers is if there are any
     """
-    return Parser(source, allow_nan, convert_nan_to, allow_inf).parse().to_python()
+    if cache is not None:
+        options = (allow_nan, convert_nan_to if allow_nan else None, allow_inf, numeric_arrays, limits)
+        return cache.parse(source, options, lambda: parse(
+            source, allow_nan, convert_nan_to, allow_inf, workers, intern_table, numeric_arrays, instrument,
+            limits=limits))
+    if workers != 1 and limits is None:
+        return parse_in_parallel(source, workers, (allow_nan, convert_nan_to, allow_inf), numeric_arrays)
+    return Parser(source, allow_nan, convert_nan_to, allow_inf, intern_table=intern_table,
+                  numeric_arrays=numeric_arrays, instrument=instrument, limits=limits).parse()
+
 
+def compile_schema(schema, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """
+    Create a parser specialised to documents of a fixed shape,
+    see SchemaParser. The source generated for a schema is
+    compiled once and shared by all parsers of it.
 
-def serialise(python_dict_or_list):
+    :param schema: dict of the keys of an object in order to their
+        schemas, list of the schema of the items of an array, or the
+        name of a scalar type, one of int, float, number, string,
+        bool, null and any, with a trailing ? if it may be null,
+        e.g. {"id": "int", "tags": ["string"], "score": "float?"}
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    """
+    return SchemaParser(schema, allow_nan, convert_nan_to, allow_inf)
+
+
+def parse_file(path, mmap=True, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """
+    Parse JSON elements from a UTF-8 file.
+
+    :param mmap: when set to True, the file is parsed straight
+        from a memory map of it and only strings and numbers are
+        decoded, so that the whole text is never read into
+        memory, otherwise it is read into a string first
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    """
+    if mmap:
+        return parse_mapped_file(path, allow_nan, convert_nan_to, allow_inf)
+    with open(path, encoding='utf-8') as f:
+        return Parser(f.read(), allow_nan, convert_nan_to, allow_inf).parse()
+
+
+def parse_lazy(source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """
+    Parse JSON elements from string lazily. Only the structure
+    of a container is scanned when it is first accessed and
+    its values are decoded when they are indexed into, either
+    to python or to containers of the same kind. Decoding the
+    whole document is still possible with to_python.
+
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    """
+    return lazy_root(source, allow_nan, convert_nan_to, allow_inf)
+
+
+def parse_document(source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """
+    Parse JSON elements from string into a Document keeping the
+    source offsets of the containers, which parses only what an
+    edit changes again, see Document.apply_edit.
+
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    """
+    return Document(source, allow_nan, convert_nan_to, allow_inf)
+
+
+def extract(source: str, paths, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """
+    Decode only the values on the given paths, skipping all
+    other parts of the document by bracket matching alone.
+
+    Paths start with $ for the root element and go on with
+    .key, ['key'], [index] or the wildcards .* and [*], e.g.
+    $.Py.CPython[2].PYTHON or $.URL2[*].
+
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    :return: dict mapping each path to the list of the
+        values on it in document order
+    """
+    return extract_paths(source, paths, (allow_nan, convert_nan_to, allow_inf))
+
+
+def _read_chunks(source, chunk_size):
+    """Iterate over the chunks read from a file-like object, chunks
+    of bytes being decoded as UTF-8 even if a char is split between two."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    rest = decoder.decode(b'', final=True)
+    if rest:
+        yield rest
+
+
+def iterparse(source, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False, chunk_size=65536):
+    """
+    Iterate over (path, event, value) tuples parsed from a string
+    or a file-like object read chunk by chunk, without building
+    any container. See IncrementalParser.read_events for events.
+
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    :param chunk_size: number of chars, or bytes of a
+        binary file, parsed at a time
+    """
+    parser = IncrementalParser(allow_nan, convert_nan_to, allow_inf, events=True)
+    if isinstance(source, str):
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    else:
+        chunks = _read_chunks(source, chunk_size)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def serialise(python_dict_or_list, stats=None, ensure_ascii=False):
     """Convert python dict or list to JSON string.
-    Note that NaN and Inf is not allowed."""
-    return Parser.from_python(python_dict_or_list).__str__()
+    Note that NaN and Inf is not allowed.
+
+    :param stats: ParseStats which the time spent is added to
+    :param ensure_ascii: when set to True, non ASCII chars
+        in strings are escaped as \\uXXXX too
+    """
+    if stats is None:
+        return encode(python_dict_or_list, ensure_ascii)
+    with stats.timed('serialise'):
+        return encode(python_dict_or_list, ensure_ascii)
+
+
+def iter_serialise(python_dict_or_list, chunk_size=65536, ensure_ascii=False):
+    """
+    Convert python dict or list to JSON string chunk by chunk,
+    walking it depth first so that the whole string is never
+    built in memory. Note that NaN and Inf is not allowed.
+
+    :param chunk_size: number of chars of each chunk except
+        for the last one
+    :param ensure_ascii: see serialise
+    """
+    return iter_chunks(python_dict_or_list, chunk_size, ensure_ascii)
+
+
+def dump(python_dict_or_list, fp, chunk_size=65536, ensure_ascii=False):
+    """
+    Write python dict or list as JSON string to a file-like
+    object chunk by chunk, see iter_serialise.
+    """
+    for chunk in iter_chunks(python_dict_or_list, chunk_size, ensure_ascii):
+        fp.write(chunk)
+
+
+def parse_lines(path_or_fp, workers=None, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False,
+                block_size=1048576):
+    """
+    Parse JSON Lines, one root element per line, in a pool of
+    processes and return the list of the parsed elements in
+    file order. Blank lines are skipped.
+
+    :param path_or_fp: path of a file, split into newline aligned
+        ranges read by the workers themselves, or a file-like
+        object opened in text or binary mode
+    :param workers: number of processes, all cores if None,
+        with 1 the lines are parsed in the current process
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    :param block_size: number of bytes parsed by a worker at a time
+    """
+    return list(iter_records(path_or_fp, workers, True, (allow_nan, convert_nan_to, allow_inf), block_size))
+
+
+def iter_lines(path_or_fp, workers=None, ordered=False, allow_nan=False, convert_nan_to=PY_FLOAT_NAN,
+               allow_inf=False, block_size=1048576):
+    """
+    Iterate over the elements parsed from JSON Lines, see
+    parse_lines. Only a few blocks are held in memory at a
+    time, and unless ordered is set to True the elements of a
+    block are yielded as soon as it is parsed, regardless of
+    blocks before it.
+    """
+    return iter_records(path_or_fp, workers, ordered, (allow_nan, convert_nan_to, allow_inf), block_size)
+
+
+def dump_lines(iterable, fp, workers=None, batch_size=1000):
+    """
+    Write python dicts or lists to a text file-like object as
+    JSON Lines, serialising them in a pool of processes. Lines
+    are written in the order of the iterable.
+
+    :param workers: number of processes, all cores if None,
+        with 1 the elements are serialised in the current process
+    :param batch_size: number of elements serialised by a
+        worker at a time
+    """
+    write_records(iterable, fp, workers, batch_size)
+
+
+async def parse_async(reader, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False, chunk_size=65536,
+                      slice_size=4096, limits=None):
+    """
+    Parse JSON elements read from an asyncio.StreamReader or an async
+    iterator of chunks of string or UTF-8 bytes, giving control back
+    to the event loop after each slice of slice_size chars parsed.
+
+    :param allow_nan: when set to True, NaN would
+        be converted to convert_nan_to, by default
+        PY_FLOAT_NAN
+    :param convert_nan_to: what to convert NaN to
+    :param allow_inf: when set to True, Inf and
+        -Inf would be converted to corresponding
+        python floating point number
+    :param chunk_size: number of bytes read at a time
+    :param slice_size: number of chars parsed at a time
+    :param limits: ParseLimits checked while scanning, so that
+        reading stops at the first one exceeded, see Parser
+    """
+    parser = IncrementalParser(allow_nan, convert_nan_to, allow_inf, limits=limits)
+    async for _ in feed_async(parser, reader, chunk_size, slice_size):
+        pass
+    return parser.close()
+
+
+async def iterparse_async(reader, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False, chunk_size=65536,
+                          slice_size=4096):
+    """
+    Iterate asynchronously over (path, event, value) tuples parsed
+    from an asyncio.StreamReader or an async iterator of chunks,
+    see iterparse and parse_async.
+    """
+    parser = IncrementalParser(allow_nan, convert_nan_to, allow_inf, events=True)
+    async for _ in feed_async(parser, reader, chunk_size, slice_size):
+        for event in parser.read_events():
+            yield event
+    parser.close()
+    for event in parser.read_events():
+        yield event
+
+
+async def dump_async(python_dict_or_list, writer, chunk_size=65536, encoding='utf-8'):
+    """
+    Write python dict or list as JSON string to an asyncio.StreamWriter
+    chunk by chunk, waiting for writer.drain() after each chunk.
+
+    :param chunk_size: number of chars of each chunk
+    :param encoding: encoding of the bytes written
+    """
+    await write_async(python_dict_or_list, writer, chunk_size, encoding)
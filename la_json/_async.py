@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Parsing from and serialising to asyncio streams.
+"""
+
+__author__ = 'Nb'
+
+import asyncio
+import codecs
+
+from ._parser import IncrementalParser
+from ._serialiser import iter_chunks
+
+
+async def _iter_chunks(reader, chunk_size):
+    """
+    Iterate over the chunks of an asyncio.StreamReader, or anything
+    with a read coroutine, or an async iterator of chunks. Chunks of
+    bytes are decoded as UTF-8, even if a char is split between two.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    if hasattr(reader, 'read'):
+        async def read():
+            while True:
+                chunk = await reader.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        chunks = read()
+    else:
+        chunks = reader
+    async for chunk in chunks:
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    rest = decoder.decode(b'', final=True)
+    if rest:
+        yield rest
+
+
+async def feed_async(parser: IncrementalParser, reader, chunk_size, slice_size):
+    """
+    Feed an incremental parser with what is read from reader, slice
+    by slice of at most slice_size chars, and give control back to
+    the event loop after each slice, so that a large chunk does not
+    keep other coroutines waiting until it is parsed.
+
+    :return: async iterator, yielding after each slice
+    """
+    async for chunk in _iter_chunks(reader, chunk_size):
+        for start in range(0, len(chunk), slice_size):
+            parser.feed(chunk[start:start + slice_size])
+            yield
+            await asyncio.sleep(0)
+
+
+async def write_async(python_dict_or_list, writer, chunk_size, encoding):
+    """
+    Serialise to an asyncio.StreamWriter chunk by chunk, waiting
+    for drain after each chunk so that a slow reader holds the
+    serialisation back instead of the buffer growing.
+    """
+    for chunk in iter_chunks(python_dict_or_list, chunk_size):
+        writer.write(chunk.encode(encoding))
+        await writer.drain()
+        # drain does not wait if the buffer is not full
+        await asyncio.sleep(0)
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Cache of the elements parsed from repeated documents.
+"""
+
+__author__ = 'Nb'
+
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from types import MappingProxyType
+
+from ._numeric import numpy
+
+VIEW = 'view'
+COPY = 'copy'
+
+
+def _copy_leaf(value, freeze):
+    """Copy or freeze an item which is not a dict or list. Typed
+    arrays of numbers, see numeric_arrays of Parser, are mutable."""
+    if type(value) is array:
+        return memoryview(value).toreadonly() if freeze else array(value.typecode, value)
+    elif numpy is not None and type(value) is numpy.ndarray:
+        value = value.copy()
+        if freeze:
+            value.flags.writeable = False
+    return value
+
+
+def copy_element(element, freeze=False):
+    """
+    Copy python dicts and lists parsed from a document without
+    recursion, breadth first, so that deep documents are fine.
+
+    :param freeze: when set to True, dicts are turned into read only
+        mappings and lists into tuples, so that the copy is immutable
+    """
+    if type(element) is not dict and type(element) is not list:
+        return _copy_leaf(element, freeze)
+    root = {} if type(element) is dict else []
+
+    # (original, copy) of each container in the order
+    # they are created, parents before children
+    created = [(element, root)]
+    i = 0
+    while i < len(created):
+        original, copied = created[i]
+        i += 1
+        if type(original) is dict:
+            for key, value in original.items():
+                value_type = type(value)
+                if value_type is dict or value_type is list:
+                    copied[key] = child = {} if value_type is dict else []
+                    created.append((value, child))
+                else:
+                    copied[key] = _copy_leaf(value, freeze)
+        else:
+            append = copied.append
+            for value in original:
+                value_type = type(value)
+                if value_type is dict or value_type is list:
+                    append({} if value_type is dict else [])
+                    created.append((value, copied[-1]))
+                else:
+                    append(_copy_leaf(value, freeze))
+    if not freeze:
+        return root
+
+    # children are frozen before their parents
+    frozen = {}
+    for _, copied in reversed(created):
+        if type(copied) is dict:
+            for key, value in copied.items():
+                if type(value) is dict or type(value) is list:
+                    copied[key] = frozen[id(value)]
+            frozen[id(copied)] = MappingProxyType(copied)
+        else:
+            frozen[id(copied)] = tuple(frozen[id(value)] if type(value) is dict or type(value) is list else value
+                                       for value in copied)
+    return frozen[id(root)]
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parsed elements, keyed by a digest of the
+    source and the options of the parser, so that parsing the same
+    document again is a dictionary lookup. The least recently used
+    entries are evicted once there are more than max_entries of
+    them or their sources add up to more than max_bytes.
+
+    Statistics are kept in hits, misses and evictions.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=67108864, mode=COPY):
+        """
+        Create an empty cache.
+
+        :param max_entries: maximum number of entries
+        :param max_bytes: maximum total size of the sources of
+            the entries in bytes, larger sources are not cached
+        :param mode: COPY to get a new copy of the python dicts
+            and lists on each parse, which the caller may change,
+            or VIEW to get the same immutable one every time, with
+            read only mappings instead of dicts and tuples instead
+            of lists, which saves copying
+        """
+        if mode != COPY and mode != VIEW:
+            raise ValueError('Cache mode must be either %s or %s, not %s' % (COPY, VIEW, mode))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<ParseCache: %s entries, %s bytes, %s hits, %s misses, %s evictions>' % \
+               (len(self), self.size_bytes, self.hits, self.misses, self.evictions)
+
+    def clear(self):
+        """Remove all entries, keeping the statistics."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def parse(self, source, options, parse):
+        """
+        Get the element parsed from source with options, calling
+        parse to parse it if it is not in the cache.
+
+        :param source: string, or bytes-like object or memory map
+            of UTF-8 bytes
+        :param options: hashable options of the parser, entries
+            parsed with different options are different
+        :param parse: function parsing source with options
+        """
+        data = source.encode('utf-8', 'surrogatepass') if isinstance(source, str) else source
+        key = (blake2b(data, digest_size=16).digest(), options)
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            # unhashable options, e.g. convert_nan_to
+            return parse()
+        freeze = self.mode == VIEW
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0] if freeze else copy_element(entry[0])
+        self.misses += 1
+        element = parse()
+        size = memoryview(data).nbytes
+        if size > self.max_bytes:
+            return copy_element(element, True) if freeze else element
+        # the caller gets the parsed element itself in COPY mode
+        # and the cache keeps a copy of it
+        cached = copy_element(element, freeze)
+        self._entries[key] = cached, size
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self.size_bytes -= self._entries.popitem(last=False)[1][1]
+            self.evictions += 1
+        return cached if freeze else element
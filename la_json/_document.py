@@ -0,0 +1,316 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Documents keeping the source offsets of their containers,
+re-parsed incrementally after edits.
+"""
+
+__author__ = 'Nb'
+
+from ._util import PY_FLOAT_NAN, JSONSyntaxError, syntax_error_at
+from ._elements import JSONIdentifier
+from ._lazy import _STRUCTURE, _CLOSING, _strip, find_root, decode
+
+
+def _decode_scalar(source, start, end, options):
+    """Decode the value at source[start:end] which is not a
+    container, converting plain strings and numbers directly
+    the same way as the parser."""
+    if source[start] != '"':
+        text = source[start:end]
+        if text in JSONIdentifier.IDENTIFIER_SET:
+            return JSONIdentifier.IDENTIFIER_TO_PYTHON_DICT[text]
+        elif text.lower() not in JSONIdentifier.EXTENDED_FLOAT_NUMBERS:
+            try:
+                return int(text)
+            except ValueError:
+                try:
+                    return float(text)
+                except ValueError:
+                    pass
+    return decode(source, start, end, options)
+
+
+def _shift(shifts, i, delta):
+    """Shift the offsets of members from index i on by delta,
+    shifts being a Fenwick tree over the members."""
+    i += 1
+    size = len(shifts)
+    while i < size:
+        shifts[i] += delta
+        i += i & -i
+
+
+def _shifted(shifts, i):
+    """Get the shift of the offset of the member at index i."""
+    i += 1
+    total = 0
+    while i:
+        total += shifts[i]
+        i -= i & -i
+    return total
+
+
+class _Node:
+    """
+    A container of a document. The offsets of its members are
+    relative to its start, and shifted by edits before them, so
+    that an edit only changes the containers enclosing it.
+    """
+
+    __slots__ = ('length', 'keys', 'children', 'starts', 'lengths', 'shifts', 'value')
+
+    def member_start(self, i):
+        """Offset of the value of the member at index i."""
+        return self.starts[i] + _shifted(self.shifts, i)
+
+    def member_at(self, offset):
+        """Index of the last member whose value starts at
+        or before offset, or -1 if there is none."""
+        low, high = 0, len(self.starts)
+        while low < high:
+            middle = (low + high) // 2
+            if self.member_start(middle) <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+
+def scan_container(source, start, options, reuse):
+    """
+    Scan the container starting at start and all of the containers
+    in it in one pass, decoding their keys and values.
+
+    :param reuse: dict mapping offsets to the nodes of containers
+        known to be there, which are not scanned again
+    :return: the node of the container and the number of
+        chars scanned
+    """
+    search = _STRUCTURE.search
+    root = _Node()
+    skipped = 0
+    # [node, start, closing, item_start, key_start, key_end,
+    # child, child_start, members] of the open containers
+    stack = [[root, start, _CLOSING[source[start]], start + 1, None, None, None, None, []]]
+    pos = start + 1
+    while True:
+        match = search(source, pos)
+        if match is None:
+            raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+        index = match.start()
+        char = source[index]
+        pos = match.end()
+        frame = stack[-1]
+        if char == '"':
+            continue
+        elif char == '{' or char == '[':
+            if frame[6] is not None:
+                raise syntax_error_at(source, index, 'Invalid member of container')
+            child = reuse.get(index)
+            frame[6], frame[7] = child, index
+            if child is None:
+                frame[6] = _Node()
+                stack.append([frame[6], index, _CLOSING[char], pos, None, None, None, None, []])
+            else:
+                pos = index + child.length
+                skipped += child.length
+        elif char == ':':
+            key_start, key_end = _strip(source, frame[3], index)
+            if key_start == key_end or source[key_start] != '"' or frame[4] is not None:
+                raise syntax_error_at(source, index, 'Object key must be a string')
+            frame[4], frame[5] = key_start, key_end
+            frame[3] = pos
+        elif char == ',' or char == frame[2]:
+            node, node_start, closing, item_start, key_start, key_end, child, child_start, members = frame
+            value_start, value_end = _strip(source, item_start, index)
+            if value_start != value_end or char == ',' or key_start is not None:
+                if value_start == value_end or (closing == '}') != (key_start is not None) or \
+                        child is not None and (value_start != child_start or value_end != child_start + child.length):
+                    raise syntax_error_at(source, index, 'Invalid member of container')
+                members.append((key_start, key_end, value_start, value_end, child))
+            frame[3:8] = pos, None, None, None, None
+            if char == closing:
+                node.length = pos - node_start
+                _finish(source, node, node_start, closing == '}', members, options)
+                stack.pop()
+                if not stack:
+                    return root, root.length - skipped
+        else:
+            raise syntax_error_at(source, index, 'Invalid end character for container')
+
+
+def _finish(source, node, start, is_object, members, options):
+    """Fill a scanned node in, its children being done."""
+    node.keys = [_decode_scalar(source, key_start, key_end, options)
+                 for key_start, key_end, _, _, _ in members] if is_object else None
+    node.children = [member[4] for member in members]
+    node.starts = [value_start - start for _, _, value_start, _, _ in members]
+    node.lengths = [value_end - value_start for _, _, value_start, value_end, _ in members]
+    node.shifts = [0] * (len(members) + 1)
+    values = [_decode_scalar(source, value_start, value_end, options) if child is None else child.value
+              for _, _, value_start, value_end, child in members]
+    node.value = dict(zip(node.keys, values)) if is_object else values
+
+
+class Document:
+    """
+    A parsed document keeping the source offsets of its containers,
+    so that after an edit only the smallest container enclosing it
+    is parsed again, reusing the containers in it which the edit
+    does not touch, and the offsets after the edit are shifted in
+    the containers enclosing it alone.
+
+    The number of chars scanned by the last parse is kept in
+    reparsed.
+    """
+
+    def __init__(self, source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+        """
+        Parse a document from string.
+
+        :param allow_nan: when set to True, NaN would
+            be converted to convert_nan_to, by default
+            PY_FLOAT_NAN
+        :param convert_nan_to: what to convert NaN to
+        :param allow_inf: when set to True, Inf and
+            -Inf would be converted to corresponding
+            python floating point number
+        """
+        self._options = allow_nan, convert_nan_to, allow_inf
+        self._parse_all(source)
+
+    def _parse_all(self, source):
+        """Parse the whole source."""
+        root_start = find_root(source)
+        self._root, self.reparsed = scan_container(source, root_start, self._options, {})
+        self._root_start = root_start
+        self.source = source
+
+    @property
+    def root(self):
+        """The root element as python dict or list. Containers the
+        edits do not replace are updated in place."""
+        return self._root.value
+
+    def span(self, *path):
+        """
+        Get the (start, end) offsets of the value on a path of
+        keys and indices, the whole document if there are none.
+        """
+        node, start, length = self._root, self._root_start, self._root.length
+        for step in path:
+            if node is None:
+                raise TypeError('Cannot look up *%s* in a scalar' % step)
+            i = self._index(node, step)
+            start += node.member_start(i)
+            child = node.children[i]
+            length = node.lengths[i] if child is None else child.length
+            node = child
+        return start, start + length
+
+    @staticmethod
+    def _index(node, step):
+        """Index of the member of node on step, the last one
+        of duplicated keys being the one kept in the value."""
+        if node.keys is None:
+            i = step + len(node.starts) if step < 0 else step
+            if not 0 <= i < len(node.starts):
+                raise IndexError('Array index out of range')
+            return i
+        elif step not in node.value:
+            raise KeyError(step)
+        return len(node.keys) - 1 - node.keys[::-1].index(step)
+
+    def apply_edit(self, start: int, end: int, new_text: str):
+        """
+        Replace source[start:end] with new_text and parse what
+        changed, the smallest container enclosing the edit first
+        and the ones enclosing it in turn if the edit does not leave
+        it a valid container of the new length. If the edit makes
+        the document invalid, it is left unchanged.
+
+        :return: the root element
+        """
+        if not 0 <= start <= end <= len(self.source):
+            raise IndexError('Edit range %s:%s out of the document of %s chars' % (start, end, len(self.source)))
+        source = ''.join((self.source[:start], new_text, self.source[end:]))
+        delta = len(new_text) - (end - start)
+
+        # (node, start, index of the next one in it) of
+        # the containers enclosing the edit, outermost first
+        path = []
+        node, node_start = self._root, self._root_start
+        if node_start < start and end < node_start + node.length:
+            while node is not None:
+                i = node.member_at(start - node_start)
+                path.append([node, node_start, i])
+                if i < 0 or node.children[i] is None:
+                    break
+                child_start = node_start + node.member_start(i)
+                node = node.children[i]
+                if not (child_start < start and end < child_start + node.length):
+                    break
+                node_start = child_start
+
+        for level in range(len(path) - 1, -1, -1):
+            node, node_start, _ = path[level]
+            try:
+                new_node, reparsed = scan_container(source, node_start, self._options,
+                                                    self._untouched(node, node_start, start, end, delta))
+            except JSONSyntaxError:
+                continue
+            if new_node.length == node.length + delta:
+                self._replace(path, level, new_node, delta)
+                self.reparsed = reparsed
+                self.source = source
+                return self.root
+        self._parse_all(source)
+        return self.root
+
+    @staticmethod
+    def _untouched(node, node_start, start, end, delta):
+        """Map the new offsets of the children of node which the edit
+        of source[start:end] does not touch to their nodes."""
+        reuse = {}
+        for i, child in enumerate(node.children):
+            if child is not None:
+                child_start = node_start + node.member_start(i)
+                if child_start + child.length <= start:
+                    reuse[child_start] = child
+                elif child_start >= end:
+                    reuse[child_start + delta] = child
+        return reuse
+
+    def _replace(self, path, level, new_node, delta):
+        """Replace the node at level of path with new_node, shifting
+        the members after it in the nodes enclosing it by delta."""
+        if not level:
+            self._root = new_node
+            return
+        parent, _, i = path[level - 1]
+        parent.children[i] = new_node
+        if parent.keys is None:
+            parent.value[i] = new_node.value
+        elif self._index(parent, parent.keys[i]) == i:
+            # an earlier duplicate of the key is not in the value
+            parent.value[parent.keys[i]] = new_node.value
+        if delta:
+            for node, _, i in path[:level]:
+                node.length += delta
+                _shift(node.shifts, i + 1, delta)
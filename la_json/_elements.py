@@ -21,22 +21,27 @@ Definition of JSON elements.
 
 __author__ = 'Nb'
 
-from ._util import Stack, PY_FLOAT_INF, PY_FLOAT_NEG_INF, JSONNonStandardElementError
+from ._util import PY_FLOAT_INF, PY_FLOAT_NEG_INF, JSONNonStandardElementError
+from ._escape import encode_string
 
 
 class JSONElement:
     """
     A JSON element.
     """
+    __slots__ = ()
 
 
 class JSONItem(JSONElement):
     """
     A JSON item.
     """
+    __slots__ = ()
 
 
 class JSONUndefined(JSONItem):
+    __slots__ = ()
+
     def __str__(self):
         return 'Undefined'
 
@@ -47,31 +52,68 @@ class JSONContainer(JSONElement):
     """
     A JSON container.
     """
+    __slots__ = ()
 
     def __init__(self):
         """Create a JSON element."""
-        self.content_stack = Stack()
+
+
+def _kv_pair_string(key, value) -> str:
+    """Convert a K-V pair to JSON string."""
+    if value != value:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include NaN, cannot create non standard JSON string'
+        )
+    elif value in [PY_FLOAT_INF, PY_FLOAT_NEG_INF]:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include Inf, cannot create non standard JSON string'
+        )
+    if isinstance(value, str):
+        return '%s: %s' % (encode_string(key), encode_string(value))
+    else:
+        return '%s: %s' % (encode_string(key), JSONIdentifier.parse_python_keyword(value))
 
 
 class JSONObject(JSONContainer):
     """
-    A JSON object.
+    A JSON object, whose keys and values are kept
+    in two lists in the order they are set.
     """
+    __slots__ = ('key_array', 'value_array')
 
     def __init__(self):
         super(JSONObject, self).__init__()
-        self.kv_pairs = []
+        self.key_array = []
+        self.value_array = []
+
+    def __setitem__(self, key, value):
+        """Append a K-V pair."""
+        self.key_array.append(key)
+        self.value_array.append(value)
+
+    @property
+    def kv_pairs(self):
+        """Tuple of the K-V pairs of the object, built from
+        key_array and value_array, which are to be changed
+        instead, each time it is read."""
+        kv_pairs = []
+        for key, value in zip(self.key_array, self.value_array):
+            kv_pair = JSONKVPair()
+            kv_pair.key = key
+            kv_pair.value = value
+            kv_pairs.append(kv_pair)
+        return tuple(kv_pairs)
 
     def __str__(self):
-        return ''.join(['{', str(self.kv_pairs)[1:-1], '}'])
+        return ''.join(['{', ', '.join(map(_kv_pair_string, self.key_array, self.value_array)), '}'])
 
     def to_python(self):
         """Convert a JSONObject to python dict."""
         return {
-            kv.key: kv.value.to_python()
-            if isinstance(kv.value, JSONObject) or isinstance(kv.value, JSONArray)
-            else kv.value
-            for kv in self.kv_pairs
+            key: value.to_python()
+            if isinstance(value, JSONObject) or isinstance(value, JSONArray)
+            else value
+            for key, value in zip(self.key_array, self.value_array)
             }
 
     @staticmethod
@@ -79,15 +121,12 @@ class JSONObject(JSONContainer):
         """Convert a python dict to JSONObject."""
         json_object = JSONObject()
         for k, v in python_dict.items():
-            kv_pair = JSONKVPair()
-            kv_pair.key = k
             if isinstance(v, dict):
-                kv_pair.value = JSONObject.from_python(v)
+                v = JSONObject.from_python(v)
             elif isinstance(v, list):
-                kv_pair.value = JSONArray.from_python(v)
-            else:
-                kv_pair.value = v
-            json_object.kv_pairs.append(kv_pair)
+                v = JSONArray.from_python(v)
+            json_object.key_array.append(k)
+            json_object.value_array.append(v)
         return json_object
 
     __repr__ = __str__
@@ -97,24 +136,14 @@ class JSONKVPair(JSONItem):
     """
     A JSON key-value pair.
     """
+    __slots__ = ('key', 'value')
 
     def __init__(self):
         self.key = Undefined
         self.value = Undefined
 
     def __str__(self):
-        if self.value != self.value:
-            raise JSONNonStandardElementError(
-                message='JSON standard does not include NaN, cannot create non standard JSON string'
-            )
-        elif self.value in [PY_FLOAT_INF, PY_FLOAT_NEG_INF]:
-            raise JSONNonStandardElementError(
-                message='JSON standard does not include Inf, cannot create non standard JSON string'
-            )
-        if isinstance(self.value, str):
-            return '"%s": "%s"' % (self.key.replace('"', r'\"'), self.value.replace('"', r'\"'))
-        else:
-            return '"%s": %s' % (self.key.replace('"', r'\"'), JSONIdentifier.parse_python_keyword(self.value))
+        return _kv_pair_string(self.key, self.value)
 
     __repr__ = __str__
 
@@ -123,15 +152,20 @@ class JSONArray(JSONContainer):
     """
     A JSON array.
     """
+    __slots__ = ('array',)
 
     def __init__(self):
         super(JSONArray, self).__init__()
         self.array = []
 
+    def append(self, item):
+        """Append an item."""
+        self.array.append(item)
+
     def __str__(self):
         return ''.join(['[',
                         ', '.join(
-                            [''.join(['"', item.replace('"', r'\"'), '"'])
+                            [encode_string(item)
                              if isinstance(item, str)
                              else JSONIdentifier.parse_python_keyword(item)
                              for item in self.array]
@@ -176,6 +210,7 @@ class JSONIdentifier(JSONItem):
     """
     JSON identifiers.
     """
+    __slots__ = ()
     IDENTIFIER_SET = ('true', 'false', 'null')
     PYTHON_SET = (True, False, None)
     IDENTIFIER_TO_PYTHON_DICT = {
@@ -199,7 +234,7 @@ class JSONIdentifier(JSONItem):
     @staticmethod
     def parse_python_keyword(item) -> str:
         """Parse python keyword."""
-        if item in JSONIdentifier.PYTHON_SET and item != 0 and item != 1:
+        if item is True or item is False or item is None:
             return JSONIdentifier.PYTHON_TO_IDENTIFIER_DICT[item]
         return str(item)
 
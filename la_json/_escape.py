@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Escaping and unescaping of JSON strings.
+"""
+
+__author__ = 'Nb'
+
+import re
+
+# chars escaped by a backslash and the char after it
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_SIMPLE_TABLE = str.maketrans(_SIMPLE_ESCAPES)
+
+# a run of valid escapes, or a backslash starting an invalid one
+_ESCAPE_RUN = re.compile(r'(?:\\(?:u[0-9a-fA-F]{4}|["\\/bfnrt]))+|\\(.{0,5})', re.S)
+_SURROGATE = re.compile('[\ud800-\udfff]')
+
+# chars which must be escaped
+_NEEDS_ESCAPE = re.compile(r'[\x00-\x1f"\\]')
+_ESCAPES = dict({chr(code): '\\u%04x' % code for code in range(32)},
+                **{'"': '\\"', '\\': '\\\\', '\b': '\\b', '\f': '\\f', '\n': '\\n', '\r': '\\r', '\t': '\\t'})
+
+# the common escapes, replaced one after another, which is much faster
+# than a regex or str.translate calling back for each char, and what
+# is left to escape afterwards
+_COMMON_ESCAPES = tuple((char, _ESCAPES[char]) for char in '\\"\n\r\t')
+_RARE_ESCAPE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_RARE_ASCII_ESCAPE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x80-\U0010ffff]')
+
+
+def _unescape_run(match):
+    """Decode a run of escapes at once."""
+    run = match.group()
+    if match.group(1) is not None:
+        raise ValueError('Invalid escape *%s*' % run)
+    # other escapes have no u, each of them is two chars
+    if 'u' not in run:
+        return run[1::2].translate(_SIMPLE_TABLE)
+    chars = []
+    append = chars.append
+    i = 0
+    while i < len(run):
+        char = run[i + 1]
+        if char == 'u':
+            append(chr(int(run[i + 2:i + 6], 16)))
+            i += 6
+        else:
+            append(_SIMPLE_ESCAPES[char])
+            i += 2
+    chars = ''.join(chars)
+    if _SURROGATE.search(chars) is None:
+        return chars
+    # surrogate pairs are joined, lone surrogates kept as they are
+    return chars.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'surrogatepass')
+
+
+def unescape(raw: str) -> str:
+    """
+    Decode the escapes in the raw content of a string.
+
+    :raise ValueError: if an escape is invalid
+    """
+    return _ESCAPE_RUN.sub(_unescape_run, raw)
+
+
+def _escape_char(match) -> str:
+    """Escape a char, as a surrogate pair beyond the BMP."""
+    char = match.group()
+    escaped = _ESCAPES.get(char)
+    if escaped is not None:
+        return escaped
+    code = ord(char)
+    if code > 0xffff:
+        code -= 0x10000
+        return '\\u%04x\\u%04x' % (0xd800 | code >> 10, 0xdc00 | code & 0x3ff)
+    return '\\u%04x' % code
+
+
+def _escape(string: str, rare) -> str:
+    """Escape the common chars in string and then those matched by rare."""
+    for char, escaped in _COMMON_ESCAPES:
+        if char in string:
+            string = string.replace(char, escaped)
+    if rare.search(string) is None:
+        return string
+    return rare.sub(_escape_char, string)
+
+
+def encode_string(string: str) -> str:
+    """Quote a string and escape the chars in it which must be."""
+    # control chars are not printable, checking for them
+    # so is faster than searching for any of them
+    if '"' not in string and '\\' not in string and string.isprintable() or \
+            _NEEDS_ESCAPE.search(string) is None:
+        return '"' + string + '"'
+    return '"' + _escape(string, _RARE_ESCAPE) + '"'
+
+
+def encode_ascii_string(string: str) -> str:
+    """Quote a string and escape the chars in it which
+    must be and non ASCII chars, see encode_string."""
+    if string.isascii():
+        return encode_string(string)
+    return '"' + _escape(string, _RARE_ASCII_ESCAPE) + '"'
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Stand-ins for containers when the parser produces events.
+"""
+
+__author__ = 'Nb'
+
+
+def value_event(value) -> str:
+    """Name the event of an item."""
+    if value is None:
+        return 'null'
+    elif value is True or value is False:
+        return 'boolean'
+    elif isinstance(value, str):
+        return 'string'
+    return 'number'
+
+
+class EventContainer:
+    """
+    A container which keeps nothing but its path, appending
+    (path, event, value) tuples to the event list instead.
+    Paths are dotted, with item standing for array items,
+    e.g. 'Py.CPython.item'.
+    """
+    __slots__ = ('prefix', 'events')
+
+    def __init__(self, prefix, events):
+        self.prefix = prefix
+        self.events = events
+
+    def child_prefix(self, key):
+        """Path of an item in the container."""
+        raise NotImplementedError
+
+
+class EventObject(EventContainer):
+    """
+    Stand-in for a JSON object.
+    """
+    __slots__ = ()
+
+    def child_prefix(self, key):
+        return '.'.join([self.prefix, key]) if self.prefix else key
+
+    def __setitem__(self, key, value):
+        # start and end of a nested container are
+        # reported by the parser itself
+        if not isinstance(value, EventContainer):
+            self.events.append((self.child_prefix(key), value_event(value), value))
+
+
+class EventArray(EventContainer):
+    """
+    Stand-in for a JSON array.
+    """
+    __slots__ = ()
+
+    def child_prefix(self, key=None):
+        return '.'.join([self.prefix, 'item']) if self.prefix else 'item'
+
+    def append(self, item):
+        if not isinstance(item, EventContainer):
+            self.events.append((self.child_prefix(), value_event(item), item))
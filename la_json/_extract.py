@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Extraction of the values on JSON paths.
+"""
+
+__author__ = 'Nb'
+
+import re
+
+from ._lazy import find_root, scan_members, decode
+
+# a step of a path, either .name, .*, [index], [*], ['name'] or ["name"]
+_STEP = re.compile(r'''\.(\*|[^.\[]+)|\[(\*|-?\d+|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")\]''')
+_ESCAPE = re.compile(r'\\(.)')
+
+
+class _Wildcard:
+    """Step matching any key or index."""
+
+    def __repr__(self):
+        return '*'
+
+
+WILDCARD = _Wildcard()
+
+
+def compile_path(path: str):
+    """
+    Split a path like $.Py.CPython[2].PYTHON into its steps,
+    which are keys, indices or WILDCARD.
+    """
+    if not path.startswith('$'):
+        raise ValueError('JSON path must start with $: %s' % path)
+    steps = []
+    pos = 1
+    while pos < len(path):
+        match = _STEP.match(path, pos)
+        if match is None:
+            raise ValueError('Invalid JSON path %s at %s' % (path, pos))
+        name, subscript = match.groups()
+        if name is not None:
+            steps.append(WILDCARD if name == '*' else name)
+        elif subscript == '*':
+            steps.append(WILDCARD)
+        elif subscript[0] in '\'"':
+            steps.append(_ESCAPE.sub(r'\1', subscript[1:-1]))
+        else:
+            steps.append(int(subscript))
+        pos = match.end()
+    return tuple(steps)
+
+
+def _select(source, start, end, targets, options):
+    """
+    Select the value at source[start:end] for the targets.
+
+    :param targets: list of (results, steps, i), the value
+        being on the path of steps[:i]
+    """
+    walking = []
+    value = decoded = None
+    for results, steps, i in targets:
+        if i == len(steps):
+            if not decoded:
+                value, decoded = decode(source, start, end, options), True
+            results.append(value)
+        else:
+            walking.append((results, steps, i))
+    if not walking or source[start] != '{' and source[start] != '[':
+        return
+
+    # only the members on the paths are looked into, the
+    # others are skipped by bracket matching alone
+    members = scan_members(source, start)[0]
+    is_object = source[start] == '{'
+    for n, (key_start, key_end, value_start, value_end) in enumerate(members):
+        key = None
+        matched = []
+        for results, steps, i in walking:
+            step = steps[i]
+            if step is WILDCARD:
+                matched.append((results, steps, i + 1))
+            elif is_object:
+                if isinstance(step, str):
+                    if key is None:
+                        key = decode(source, key_start, key_end, options)
+                    if key == step:
+                        matched.append((results, steps, i + 1))
+            elif isinstance(step, int) and (step == n or step == n - len(members)):
+                matched.append((results, steps, i + 1))
+        if matched:
+            _select(source, value_start, value_end, matched, options)
+
+
+def extract_paths(source: str, paths, options):
+    """
+    Decode only the values on paths.
+
+    :param options: allow_nan, convert_nan_to and allow_inf
+        of the parser
+    :return: dict mapping each path to the list of the
+        values on it in document order
+    """
+    selected = {path: [] for path in paths}
+    targets = [(results, compile_path(path), 0) for path, results in selected.items()]
+    _select(source, find_root(source), len(source), targets, options)
+    return selected
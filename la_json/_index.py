@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Index of the structural chars of a JSON string.
+"""
+
+__author__ = 'Nb'
+
+import re
+from array import array
+
+# NumPy is optional, the index is built with regular
+# expressions if it is not installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# a whole string or a structural char, in a string
+# and in UTF-8 bytes respectively
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]', re.S)
+_BYTES_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]', re.S)
+
+_STRUCTURAL_CODES = [ord(char) for char in '{}[]:,']
+_QUOTE_CODE = ord('"')
+_OPENING_CODES = [ord(char) for char in '{[']
+_CLOSING_CODES = [ord(char) for char in '}]']
+_COMMA_CODE = ord(',')
+_BACKSLASH_CODE = ord('\\')
+
+# do not bother NumPy with short strings
+NUMPY_THRESHOLD = 4096
+
+
+def _build_with_re(source):
+    """Build the index by matching whole strings and structural chars."""
+    index = array('q')
+    append = index.append
+    for match in (_TOKEN if isinstance(source, str) else _BYTES_TOKEN).finditer(source):
+        start, end = match.span()
+        append(start)
+        # only strings are longer than one char
+        if end - start > 1:
+            append(end - 1)
+    return index
+
+
+def _codes(source):
+    """Code points of the chars of source, or its bytes, as a NumPy array."""
+    if not isinstance(source, str):
+        return numpy.frombuffer(source, dtype=numpy.uint8)
+    elif source.isascii():
+        return numpy.frombuffer(source.encode('ascii'), dtype=numpy.uint8)
+    return numpy.frombuffer(source.encode('utf-32-le'), dtype=numpy.uint32)
+
+
+def _build_with_numpy(source, codes=None):
+    """Build the index with vectorised operations over the whole string."""
+    if codes is None:
+        codes = _codes(source)
+    quotes = numpy.flatnonzero(codes == _QUOTE_CODE)
+    backslashes = numpy.flatnonzero(codes == _BACKSLASH_CODE)
+
+    # a quote is escaped if it follows a run of an odd number of backslashes
+    if len(quotes) and len(backslashes):
+        breaks = numpy.flatnonzero(numpy.diff(backslashes) != 1)
+        run_starts = backslashes[numpy.concatenate(([0], breaks + 1))]
+        run_ends = backslashes[numpy.concatenate((breaks, [len(backslashes) - 1]))]
+        runs = numpy.minimum(numpy.searchsorted(run_ends, quotes - 1), len(run_ends) - 1)
+        escaped = (run_ends[runs] == quotes - 1) & ((run_ends[runs] - run_starts[runs]) % 2 == 0)
+        quotes = quotes[~escaped]
+
+    # a structural char is outside strings if an even number of quotes are before it
+    is_structural = codes == _STRUCTURAL_CODES[0]
+    for code in _STRUCTURAL_CODES[1:]:
+        is_structural |= codes == code
+    structural = numpy.flatnonzero(is_structural)
+    structural = structural[numpy.searchsorted(quotes, structural) % 2 == 0]
+
+    entries = numpy.concatenate((quotes, structural))
+    entries.sort(kind='stable')
+    index = array('q')
+    index.frombytes(entries.astype(numpy.int64).tobytes())
+    return index
+
+
+def build_index(source: str):
+    """
+    Build the index of the structural chars of source, that is
+    offsets of quotes, braces, brackets, colons and commas in
+    ascending order. Chars in strings and escaped quotes are
+    left out, so that strings are represented by their opening
+    and closing quotes only. For a source of UTF-8 bytes the
+    offsets are of bytes.
+
+    :return: array of offsets
+    """
+    if numpy is not None and len(source) >= NUMPY_THRESHOLD:
+        return _build_with_numpy(source)
+    return _build_with_re(source)
+
+
+def split_with_numpy(source, start, size):
+    """
+    Split the items of the array starting at start into ranges
+    of at least size chars, cut at top level commas only, which
+    are found by the depth of each structural char in the index.
+
+    :return: list of (start, end) offsets of the ranges, leaving
+        out the commas between them, and the offset after the end
+        of the array, or None if the array does not end
+    """
+    codes = _codes(source)
+    entries = numpy.frombuffer(_build_with_numpy(source, codes), dtype=numpy.int64)
+    entries = entries[entries >= start]
+    chars = codes[entries]
+    depths = numpy.cumsum(numpy.isin(chars, _OPENING_CODES).astype(numpy.int64) -
+                          numpy.isin(chars, _CLOSING_CODES))
+    closed = numpy.flatnonzero(depths == 0)
+    if not len(closed):
+        return None
+    end = int(entries[closed[0]]) + 1
+    commas = entries[:closed[0]][(chars[:closed[0]] == _COMMA_CODE) & (depths[:closed[0]] == 1)]
+
+    ranges = []
+    range_start = start + 1
+    while True:
+        i = numpy.searchsorted(commas, range_start + size)
+        if i == len(commas):
+            break
+        comma = int(commas[i])
+        ranges.append((range_start, comma))
+        range_start = comma + 1
+    ranges.append((range_start, end - 1))
+    return ranges, end
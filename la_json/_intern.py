@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Sharing of repeated keys, values and subtrees between parsed elements.
+"""
+
+__author__ = 'Nb'
+
+from sys import getsizeof
+
+# types of values a shared subtree may contain
+_SCALAR_TYPES = {str, int, float, bool, type(None)}
+
+
+class InternTable:
+    """
+    Bounded table of the keys, short strings, numbers and, if
+    enabled, small subtrees met during parsing, so that repeated
+    ones are the same object. Once the table is full, new ones are
+    no longer added but those in it are still shared.
+
+    The table may be passed to several parsers to share objects
+    between documents. Statistics are kept in hits, misses and
+    saved_bytes, the last one being the size of the duplicates
+    which are not kept thanks to the table.
+    """
+
+    def __init__(self, max_size=65536, max_length=32, share_subtrees=False, max_subtree_size=8):
+        """
+        Create an empty table.
+
+        :param max_size: maximum number of entries
+        :param max_length: strings longer than max_length
+            chars are not shared, keys are shared whatever
+            their lengths
+        :param share_subtrees: when set to True, objects and arrays
+            of at most max_subtree_size members, all of which are
+            strings, numbers, booleans or null, are shared too.
+            Note that a shared subtree is the same dict or list
+            wherever it appears, so changing one changes all.
+        :param max_subtree_size: maximum number of members
+            of a shared subtree
+        """
+        self.max_size = max_size
+        self.max_length = max_length
+        self.share_subtrees = share_subtrees
+        self.max_subtree_size = max_subtree_size
+        self._strings = {}
+        self._numbers = {}
+        self._subtrees = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+
+    def __len__(self):
+        return len(self._strings) + len(self._numbers) + len(self._subtrees)
+
+    def __repr__(self):
+        return '<InternTable: %s entries, %s hits, %s misses, %s bytes saved>' % \
+               (len(self), self.hits, self.misses, self.saved_bytes)
+
+    def _lookup(self, table, key, value):
+        """Get the shared value of key, adding value if there is none."""
+        shared = table.get(key)
+        if shared is not None:
+            self.hits += 1
+            self.saved_bytes += getsizeof(value)
+            return shared
+        self.misses += 1
+        if len(self) < self.max_size:
+            table[key] = value
+        return value
+
+    def key(self, key: str) -> str:
+        """Get the shared object of a key."""
+        return self._lookup(self._strings, key, key)
+
+    def string(self, string: str) -> str:
+        """Get the shared object of a string value."""
+        if len(string) > self.max_length:
+            return string
+        return self._lookup(self._strings, string, string)
+
+    def number(self, raw_number: str, pos, convert):
+        """
+        Get the shared value of an identifier or a number,
+        looked up by its raw string so that repeated ones
+        are not even converted. Only numbers of the JSON
+        standard are shared, the conversion of NaN and Inf
+        depending on the options of each parser.
+
+        :param convert: function converting the raw string
+            and the offset of the char after it to python
+        """
+        value = self._numbers.get(raw_number)
+        if value is not None:
+            self.hits += 1
+            self.saved_bytes += getsizeof(value)
+            return value
+        value = convert(raw_number, pos)
+        # booleans and None are shared by python itself, and
+        # a number of the JSON standard ends with a digit
+        # unlike NaN and Inf, which may be converted to anything
+        if (type(value) is int or type(value) is float) and raw_number[-1].isdigit():
+            self.misses += 1
+            if len(self) < self.max_size and len(raw_number) <= self.max_length:
+                self._numbers[raw_number] = value
+        return value
+
+    def subtree(self, container):
+        """Get the shared object of a python dict or list."""
+        if len(container) > self.max_subtree_size:
+            return container
+        is_object = type(container) is dict
+        members = container.values() if is_object else container
+        # both the types and the values identify a subtree, since
+        # True == 1 == 1.0 and 0.0 == -0.0
+        signature = []
+        for member in members:
+            member_type = type(member)
+            if member_type not in _SCALAR_TYPES:
+                return container
+            signature.append((member_type, repr(member) if member_type is float else member))
+        key = (tuple(container) if is_object else None, tuple(signature))
+        return self._lookup(self._subtrees, key, container)
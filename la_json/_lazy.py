@@ -0,0 +1,324 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Lazy JSON elements decoded on first access.
+"""
+
+__author__ = 'Nb'
+
+import re
+
+from ._util import PY_FLOAT_NAN, syntax_error_at
+from ._elements import JSONContainer, JSONObject, JSONArray
+from ._parser import Parser
+from ._index import numpy, NUMPY_THRESHOLD, split_with_numpy
+from ._escape import unescape
+
+# a whole string or a structural char, and
+# a whole string or a bracket
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],:]', re.S)
+_BRACKET = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]', re.S)
+_NON_SPACE = re.compile(r'\S')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_CLOSING = {'{': '}', '[': ']'}
+
+
+def _strip(source, start, end):
+    """Narrow source[start:end] down to its non-space chars."""
+    match = _NON_SPACE.search(source, start, end)
+    if match is None:
+        return end, end
+    start = match.start()
+    while source[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def skip_container(source, start):
+    """Find the offset after the end of the container
+    starting at start by bracket matching alone."""
+    search = _BRACKET.search
+    depth = 0
+    pos = start
+    while True:
+        match = search(source, pos)
+        if match is None:
+            raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+        char = source[match.start()]
+        pos = match.end()
+        if char == '{' or char == '[':
+            depth += 1
+        elif char != '"':
+            depth -= 1
+            if not depth:
+                return pos
+
+
+def scan_members(source, start):
+    """
+    Split the members of the container starting at start
+    without decoding any of them. Nested containers are
+    skipped by bracket matching.
+
+    :return: list of (key_start, key_end, value_start, value_end)
+        offsets, the key ones being None for array items, and the
+        offset after the end of the container
+    """
+    search = _STRUCTURE.search
+    closing = _CLOSING[source[start]]
+    is_object = closing == '}'
+    members = []
+    item_start = pos = start + 1
+    key_start = key_end = None
+    while True:
+        match = search(source, pos)
+        if match is None:
+            raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+        index = match.start()
+        char = source[index]
+        pos = match.end()
+        if char == '"':
+            continue
+        elif char == '{' or char == '[':
+            pos = skip_container(source, index)
+        elif char == ':':
+            key_start, key_end = _strip(source, item_start, index)
+            if key_start == key_end or source[key_start] != '"':
+                raise syntax_error_at(source, index, 'Object key must be a string')
+            item_start = pos
+        elif char == ',' or char == closing:
+            value_start, value_end = _strip(source, item_start, index)
+            if value_start != value_end or char == ',' or key_start is not None:
+                if value_start == value_end or is_object != (key_start is not None):
+                    raise syntax_error_at(source, index, 'Invalid member of container')
+                members.append((key_start, key_end, value_start, value_end))
+            if char == closing:
+                return members, pos
+            item_start = pos
+            key_start = key_end = None
+        else:
+            raise syntax_error_at(source, index, 'Invalid end character for container')
+
+
+def split_array(source, start, size):
+    """
+    Split the items of the array starting at start into ranges
+    of at least size chars, cut at top level commas only. Nested
+    containers are skipped by bracket matching.
+
+    :return: list of (start, end) offsets of the ranges, leaving
+        out the commas between them, and the offset after the end
+        of the array
+    """
+    if numpy is not None and len(source) - start >= NUMPY_THRESHOLD:
+        split = split_with_numpy(source, start, size)
+        if split is None:
+            raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+        return split
+    search = _STRUCTURE.search
+    ranges = []
+    range_start = pos = start + 1
+    while True:
+        match = search(source, pos)
+        if match is None:
+            raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+        index = match.start()
+        char = source[index]
+        pos = match.end()
+        if char == '"':
+            continue
+        elif char == '{' or char == '[':
+            pos = skip_container(source, index)
+        elif char == ',':
+            if index - range_start >= size:
+                ranges.append((range_start, index))
+                range_start = pos
+        elif char == ']':
+            ranges.append((range_start, index))
+            return ranges, pos
+        else:
+            raise syntax_error_at(source, index, 'Invalid end character for container')
+
+
+def find_root(source):
+    """Find the offset of the root element."""
+    match = _NON_SPACE.search(source)
+    if match is None:
+        raise syntax_error_at(source, len(source), 'No root element found before the end of the file')
+    start = match.start()
+    if source[start] != '{' and source[start] != '[':
+        raise syntax_error_at(source, start, 'Root element can either be an object or an array')
+    return start
+
+
+def decode(source, start, end, options):
+    """
+    Decode the value at source[start:end] to python.
+
+    :param options: allow_nan, convert_nan_to and allow_inf
+        of the parser
+    """
+    char = source[start]
+    if char == '{' or char == '[':
+        return Parser(source[start:end], *options).parse()
+    elif char == '"':
+        # plain strings are taken as they are if closed, the span
+        # of an unterminated one ending at a char of its content
+        if end - start >= 2 and source[end - 1] == '"' and source.find('\\', start, end) == -1 and \
+                source.find('"', start + 1, end - 1) == -1:
+            return source[start + 1:end - 1]
+        elif _STRING.fullmatch(source, start, end) is not None:
+            try:
+                return unescape(source[start + 1:end - 1])
+            except ValueError:
+                # located by the parser
+                pass
+    return Parser('[%s]' % source[start:end], *options).parse()[0]
+
+
+class _LazyContainer:
+    """
+    Mixin of containers decoded on first access.
+    """
+
+    def __init__(self, source, start, options):
+        """
+        Create a container over source starting at start.
+
+        :param options: allow_nan, convert_nan_to and allow_inf
+            of the parser
+        """
+        JSONContainer.__init__(self)
+        self._source = source
+        self._start = start
+        self._options = options
+        self._members = None
+        self._end = None
+        self._values = {}
+
+    def _scan(self):
+        """Find the offsets of the members."""
+        if self._members is None:
+            self._members, self._end = scan_members(self._source, self._start)
+        return self._members
+
+    def _decode(self, start, end):
+        """Decode the value at source[start:end]."""
+        source = self._source
+        char = source[start]
+        if char == '{':
+            return LazyJSONObject(source, start, self._options)
+        elif char == '[':
+            return LazyJSONArray(source, start, self._options)
+        return decode(source, start, end, self._options)
+
+    def _value(self, index):
+        """Get the decoded value of the member at index."""
+        try:
+            return self._values[index]
+        except KeyError:
+            value_start, value_end = self._scan()[index][2:]
+            value = self._values[index] = self._decode(value_start, value_end)
+            return value
+
+    def to_python(self):
+        """Decode the whole container to python."""
+        self._scan()
+        return decode(self._source, self._start, self._end, self._options)
+
+
+class LazyJSONObject(_LazyContainer, JSONObject):
+    """
+    A JSON object whose values are decoded on first access.
+    """
+
+    def __init__(self, source, start, options):
+        _LazyContainer.__init__(self, source, start, options)
+        self._index = None
+
+    def _keys(self):
+        """Map the decoded keys to the index of their members."""
+        if self._index is None:
+            self._index = {self._decode(key_start, key_end): i
+                           for i, (key_start, key_end, _, _) in enumerate(self._scan())}
+        return self._index
+
+    def __getitem__(self, key):
+        return self._value(self._keys()[key])
+
+    def __contains__(self, key):
+        return key in self._keys()
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def keys(self):
+        """Keys of the object."""
+        return self._keys().keys()
+
+    @property
+    def key_array(self):
+        """Decode all keys of the object."""
+        return list(self._keys())
+
+    @property
+    def value_array(self):
+        """Decode all values of the object."""
+        return [self._value(i) for i in self._keys().values()]
+
+    def __setitem__(self, key, value):
+        raise TypeError('Lazy JSON objects are read only')
+
+
+class LazyJSONArray(_LazyContainer, JSONArray):
+    """
+    A JSON array whose items are decoded on first access.
+    """
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._scan())
+        if index < 0:
+            raise IndexError('Array index out of range')
+        return self._value(index)
+
+    def __iter__(self):
+        return (self._value(i) for i in range(len(self._scan())))
+
+    def __len__(self):
+        return len(self._scan())
+
+    @property
+    def array(self):
+        """Decode all items of the array."""
+        return list(self)
+
+    def append(self, item):
+        raise TypeError('Lazy JSON arrays are read only')
+
+
+def lazy_root(source: str, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """Create the lazy root element of source."""
+    options = allow_nan, convert_nan_to, allow_inf
+    start = find_root(source)
+    if source[start] == '{':
+        return LazyJSONObject(source, start, options)
+    return LazyJSONArray(source, start, options)
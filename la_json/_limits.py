@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Limits of the parser on untrusted input.
+"""
+
+__author__ = 'Nb'
+
+# names of the limits in the order of the arguments of ParseLimits
+LIMIT_NAMES = ('max_depth', 'max_bytes', 'max_string_length', 'max_container_items', 'max_total_elements')
+
+
+class ParseLimits:
+    """
+    Limits on what a parser accepts, so that the memory and the time
+    taken by a parse of untrusted input stay bounded. A limit of None
+    is not checked. The limits are checked while scanning and the parse
+    is aborted with JSONLimitError, a JSONSyntaxError, at the first of
+    them exceeded. The same limits may be passed to several parsers.
+    """
+
+    __slots__ = LIMIT_NAMES
+
+    def __init__(self, max_depth=None, max_bytes=None, max_string_length=None, max_container_items=None,
+                 max_total_elements=None):
+        """
+        Create the limits.
+
+        :param max_depth: maximum number of nested objects
+            and arrays, the root element being at depth 1
+        :param max_bytes: maximum length of the source, in
+            chars for a string and in bytes for UTF-8 bytes,
+            including all that is fed to an IncrementalParser
+        :param max_string_length: maximum length of a string,
+            key, number or identifier as it is in the source,
+            escapes included, see max_bytes
+        :param max_container_items: maximum number of members
+            of an object or items of an array
+        :param max_total_elements: maximum number of objects,
+            arrays, strings, numbers and identifiers in all,
+            keys left out
+        """
+        for name, value in zip(LIMIT_NAMES, (max_depth, max_bytes, max_string_length, max_container_items,
+                                             max_total_elements)):
+            if value is not None and (type(value) is not int or value < 0):
+                raise ValueError('Limit %s must be None or an integer of at least 0, not *%s*' % (name, value))
+            setattr(self, name, value)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in LIMIT_NAMES)
+
+    def __eq__(self, other):
+        return isinstance(other, ParseLimits) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        return 'ParseLimits(%s)' % ', '.join('%s=%s' % (name, value) for name, value in zip(LIMIT_NAMES, self._values())
+                                             if value is not None)
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+JSON Lines, one root element per line, parsed and serialised in parallel.
+"""
+
+__author__ = 'Nb'
+
+import os
+from itertools import islice
+
+from ._parser import Parser
+from ._util import JSONSyntaxError
+from ._serialiser import encode
+from ._pool import count_workers, map_tasks
+
+
+def _relocate(error, line_no):
+    """Create the same syntax error as error, raised parsing
+    a single line, located on line line_no of the file."""
+    return type(error)(error.char, line_no + error.line_no - 1, error.char_no, error.message)
+
+
+def _parse_block(block, options, first_line_no=1):
+    """
+    Parse every non blank line of a block of bytes or string.
+
+    :param first_line_no: number of the first line of the block
+        in the file, which syntax errors are located from
+    """
+    if isinstance(block, (bytes, bytearray)):
+        block = block.decode('utf-8')
+    records = []
+    for line_no, line in enumerate(block.split('\n'), first_line_no):
+        if line and not line.isspace():
+            try:
+                records.append(Parser(line, *options).parse())
+            except JSONSyntaxError as error:
+                raise _relocate(error, line_no) if hasattr(error, 'line_no') else error
+    return records
+
+
+def _parse_range(path, start, end, options):
+    """Read the bytes of a file in [start, end) and parse them. The
+    lines before start are only counted if there is a syntax error."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        block = f.read(end - start)
+        try:
+            return _parse_block(block, options)
+        except JSONSyntaxError as error:
+            if not start or not hasattr(error, 'line_no'):
+                raise
+            f.seek(0)
+            lines_before = 0
+            while f.tell() < start:
+                lines_before += f.read(min(1 << 20, start - f.tell())).count(b'\n')
+            raise _relocate(error, lines_before + 1)
+
+
+def _serialise_batch(batch):
+    """Serialise each element of a batch onto its own line."""
+    return ''.join([encode(python_dict_or_list) + '\n' for python_dict_or_list in batch])
+
+
+def _file_ranges(path, range_size):
+    """
+    Split a file into ranges of about range_size bytes, each
+    ending right after a newline or at the end of the file.
+    """
+    size = os.path.getsize(path)
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + range_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield path, start, end
+            start = end
+
+
+def _blocks(fp, block_size):
+    """
+    Read a file-like object in blocks of about block_size
+    bytes or chars, each ending right after a newline or at
+    the end of the file, and yield them with the numbers of
+    their first lines.
+    """
+    rest = None
+    line_no = 1
+    while True:
+        block = fp.read(block_size)
+        if not block:
+            break
+        if rest:
+            block = rest + block
+        new_line = b'\n' if isinstance(block, bytes) else '\n'
+        end = block.rfind(new_line) + 1
+        if end:
+            yield block[:end], line_no
+            line_no += block.count(new_line, 0, end)
+        rest = block[end:]
+    if rest:
+        yield rest, line_no
+
+
+def iter_records(path_or_fp, workers, ordered, options, block_size):
+    """
+    Parse JSON Lines in a pool of processes and yield the
+    parsed root elements.
+
+    :param path_or_fp: path of a file, which the workers read
+        range by range themselves, or a file-like object, which
+        is read block by block and the blocks sent to the workers
+    :param ordered: when set to False, elements are yielded as
+        soon as their block is parsed instead of in file order
+    :param options: allow_nan, convert_nan_to and allow_inf
+        of the parser
+    :param block_size: number of bytes parsed by a worker at a time
+    """
+    if isinstance(path_or_fp, (str, bytes, os.PathLike)):
+        tasks = ((path, start, end, options) for path, start, end in _file_ranges(path_or_fp, block_size))
+        function = _parse_range
+    else:
+        tasks = ((block, options, line_no) for block, line_no in _blocks(path_or_fp, block_size))
+        function = _parse_block
+    for records in map_tasks(function, tasks, workers, ordered):
+        yield from records
+
+
+def write_records(iterable, fp, workers, batch_size):
+    """
+    Serialise python dicts or lists in a pool of processes
+    and write them to a file-like object, one per line and
+    in order.
+
+    :param batch_size: number of elements serialised by a
+        worker at a time
+    """
+    iterator = iter(iterable)
+    batches = iter(lambda: (list(islice(iterator, batch_size)),), ([],))
+    if count_workers(workers) == 1:
+        # nothing to gain from batches in the current process
+        for python_dict_or_list in iterator:
+            fp.write(encode(python_dict_or_list) + '\n')
+        return
+    for lines in map_tasks(_serialise_batch, batches, workers):
+        fp.write(lines)
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Arrays of numbers converted in bulk to typed arrays.
+"""
+
+__author__ = 'Nb'
+
+import re
+from array import array
+
+# NumPy is optional, numeric arrays can be
+# converted to array.array without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# a whole array of JSON numbers only, in a string
+# and in UTF-8 bytes respectively, and a char which
+# is only found in a float
+_NUMBER = r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?'
+_NUMBER_ARRAY = re.compile(r'\[\s*(%s(?:\s*,\s*%s)*)\s*\]' % (_NUMBER, _NUMBER))
+_BYTES_NUMBER_ARRAY = re.compile(_NUMBER_ARRAY.pattern.encode('ascii'))
+_FLOAT_CHAR = re.compile(r'[.eE]')
+_BYTES_FLOAT_CHAR = re.compile(rb'[.eE]')
+
+NUMERIC_ARRAY_KINDS = ('array', 'numpy')
+
+
+def check_kind(kind):
+    """Make sure numeric arrays of kind can be created."""
+    if kind not in NUMERIC_ARRAY_KINDS:
+        raise ValueError('Numeric arrays must be one of %s, not *%s*' % (', '.join(NUMERIC_ARRAY_KINDS), kind))
+    elif kind == 'numpy' and numpy is None:
+        raise ImportError('NumPy is required for numeric arrays of kind numpy')
+
+
+def match_numeric_array(source, pos, kind):
+    """
+    Convert the array starting at pos in bulk if all its items
+    are numbers, to array.array of 'q' or 'd' if kind is array
+    or to a NumPy array of int64 or float64 if kind is numpy.
+    Integers are only kept as integers if all of them are.
+
+    :return: the converted array and the offset of its closing
+        bracket, or None if it is not an array of numbers or any
+        integer is out of the range of int64
+    """
+    is_str = isinstance(source, str)
+    match = (_NUMBER_ARRAY if is_str else _BYTES_NUMBER_ARRAY).match(source, pos)
+    if match is None:
+        return None
+    numbers = match.group(1)
+    is_float = (_FLOAT_CHAR if is_str else _BYTES_FLOAT_CHAR).search(numbers) is not None
+    numbers = numbers.split(',' if is_str else b',')
+    try:
+        if kind == 'numpy':
+            converted = numpy.array(numbers, dtype=numpy.float64 if is_float else numpy.int64)
+        else:
+            converted = array('d', map(float, numbers)) if is_float else array('q', map(int, numbers))
+    except OverflowError:
+        return None
+    return converted, match.end() - 1
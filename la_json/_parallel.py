@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Parsing of a root array in parallel.
+"""
+
+__author__ = 'Nb'
+
+from ._util import JSONSyntaxError, syntax_error_at
+from ._parser import Parser
+from ._lazy import find_root, split_array
+from ._pool import count_workers, map_tasks
+from ._numeric import match_numeric_array
+
+# not worth sending to a worker if shorter
+MIN_RANGE_SIZE = 65536
+
+
+def _parse_items(items: str, options, numeric_arrays):
+    """Parse comma separated items of an array."""
+    # a range cut within ,, would parse as items followed by a
+    # trailing comma, so an empty item at either end is an error
+    stripped = items.strip()
+    if not stripped or stripped[0] == ',' or stripped[-1] == ',':
+        pos = items.find(',') if stripped[:1] == ',' else items.rfind(',')
+        raise syntax_error_at(items, pos, 'Empty item between commas')
+    parsed = Parser('[%s]' % items, *options, numeric_arrays=numeric_arrays).parse()
+    # items which are all numbers are still items of a list
+    return parsed if type(parsed) is list else parsed.tolist()
+
+
+def parse_in_parallel(source: str, workers, options, numeric_arrays=None):
+    """
+    Parse source in a pool of processes if its root element is an
+    array. The array is cut at top level commas into about four
+    ranges per worker, whose items are parsed by the workers and
+    put back together in order. Anything else is parsed in the
+    current process.
+
+    :param workers: number of processes, all cores if None
+    :param options: allow_nan, convert_nan_to and allow_inf
+        of the parser
+    :param numeric_arrays: numeric_arrays of the parser
+    """
+    workers = count_workers(workers)
+    if workers == 1:
+        return Parser(source, *options, numeric_arrays=numeric_arrays).parse()
+    if not isinstance(source, str):
+        # the split is done on strings, and the slices sent
+        # to the workers would be copied anyway
+        try:
+            source = str(source, 'utf-8')
+        except UnicodeDecodeError:
+            return Parser(source, *options, numeric_arrays=numeric_arrays).parse()
+    try:
+        start = find_root(source)
+        if source[start] != '[' or numeric_arrays is not None and \
+                match_numeric_array(source, start, numeric_arrays) is not None:
+            # a root array of numbers only is converted in one step
+            return Parser(source, *options, numeric_arrays=numeric_arrays).parse()
+        ranges = split_array(source, start, max(len(source) // (workers * 4), MIN_RANGE_SIZE))[0]
+        if len(ranges) == 1:
+            return Parser(source, *options, numeric_arrays=numeric_arrays).parse()
+        root = []
+        tasks = ((source[i:j], options, numeric_arrays) for i, j in ranges)
+        for items in map_tasks(_parse_items, tasks, workers):
+            root.extend(items)
+        return root
+    except JSONSyntaxError:
+        # the line and column found by the scan or in a slice may
+        # differ from the parser, so parse again to raise the error
+        # where the parser finds it
+        return Parser(source, *options, numeric_arrays=numeric_arrays).parse()
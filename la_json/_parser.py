@@ -21,8 +21,19 @@ The parser.
 
 __author__ = 'Nb<k.memo@live.cn>'
 
-from ._util import Stack, JSONSyntaxError, JSONNonStandardElementError, PY_FLOAT_NAN
-from ._elements import JSONObject, JSONArray, JSONKVPair, Undefined, JSONIdentifier
+import os
+import re
+import mmap
+import time
+from functools import partial
+
+from ._util import JSONSyntaxError, JSONNonStandardElementError, JSONLimitError, PY_FLOAT_NAN, locate
+from ._elements import JSONObject, JSONArray, JSONIdentifier
+from ._events import EventObject, EventArray
+from ._index import build_index
+from ._numeric import check_kind, match_numeric_array
+from ._stats import ParseStats
+from ._escape import unescape
 
 
 class States:
@@ -47,6 +58,88 @@ class States:
     ARRAY_EXIT = 12
 
 
+# classes of the chars the state machine dispatches on, any
+# other char being of _OTHER, and runs of space chars, those
+# of str.isspace, being skipped in one step
+_OPEN_OBJECT, _CLOSE_OBJECT, _OPEN_ARRAY, _CLOSE_ARRAY, _COMMA, _COLON, _QUOTE, _OTHER, _SPACE_LEAD, _SPACE = \
+    range(10)
+_CHAR_CLASSES = {'{': _OPEN_OBJECT, '}': _CLOSE_OBJECT, '[': _OPEN_ARRAY, ']': _CLOSE_ARRAY, ',': _COMMA,
+                 ':': _COLON, '"': _QUOTE}
+_CHAR_CLASSES.update(dict.fromkeys((chr(code) for code in range(0x3001) if chr(code).isspace()), _SPACE))
+
+# a run of plain chars and escapes in a string, and
+# chars which end an identifier or a number
+_STRING_RUN = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+_IDENTIFIER_STOP = re.compile(r'[,}\]]')
+_NON_SPACE = re.compile(r'\S')
+
+# the same for a source of UTF-8 bytes, indexed by the codes of
+# the chars, all stop chars being ASCII they never match within a
+# multibyte char, and the first bytes of the space chars beyond
+# ASCII being of _SPACE_LEAD
+_BYTE_CLASSES = {ord(char): char_class for char, char_class in _CHAR_CLASSES.items() if char < '\x80'}
+_BYTE_CLASSES.update(dict.fromkeys((char.encode('utf-8')[0] for char in _CHAR_CLASSES if char >= '\x80'), _SPACE_LEAD))
+_BYTES_STRING_RUN = re.compile(_STRING_RUN.pattern.encode('ascii'), re.S)
+_BYTES_IDENTIFIER_STOP = re.compile(rb'[,}\]]')
+_BYTES_NON_SPACE = re.compile(rb'[^\t\n\x0b\x0c\r\x1c-\x1f ]')
+
+
+# names of the states by their values
+STATE_NAMES = {value: name for name, value in vars(States).items() if not name.startswith('_')}
+
+# transitions between tokens, the handler run on each class of
+# char in each state by its name, and the state each handler does
+# the work of, to which it is counted as a turn when instrumented
+_TRANSITIONS = {
+    States.ENTRANCE: {_OPEN_OBJECT: 'open_object', _OPEN_ARRAY: 'open_array'},
+    States.OBJECT_EXPECT_KEY: {_QUOTE: 'object_key', _CLOSE_OBJECT: 'close_object'},
+    States.OBJECT_EXPECT_COLON: {_COLON: 'colon'},
+    States.OBJECT_EXPECT_VALUE: {_OPEN_OBJECT: 'open_object', _OPEN_ARRAY: 'open_array', _QUOTE: 'object_string',
+                                 None: 'object_identifier'},
+    States.OBJECT_EXIT: {_COMMA: 'next_key', _CLOSE_OBJECT: 'close_object'},
+    States.ARRAY_EXPECT_ITEM: {_OPEN_OBJECT: 'open_object', _OPEN_ARRAY: 'open_array', _CLOSE_ARRAY: 'close_array',
+                               _QUOTE: 'array_string', None: 'array_identifier'},
+    States.ARRAY_EXIT: {_COMMA: 'next_item', _CLOSE_ARRAY: 'close_array'},
+}
+_HANDLER_STATES = {
+    'open_object': States.OBJECT_INITIAL,
+    'object_key': States.OBJECT_KEY,
+    'colon': States.OBJECT_EXPECT_VALUE,
+    'object_string': States.OBJECT_VALUE_STRING,
+    'object_identifier': States.OBJECT_VALUE_IDENTIFIER,
+    'next_key': States.OBJECT_EXPECT_KEY,
+    'close_object': States.OBJECT_EXIT,
+    'open_array': States.ARRAY_INITIAL,
+    'array_string': States.ARRAY_STRING,
+    'array_identifier': States.ARRAY_IDENTIFIER,
+    'next_item': States.ARRAY_EXPECT_ITEM,
+    'close_array': States.ARRAY_EXIT,
+}
+
+# what is expected in the states in which a char may be unexpected
+_UNEXPECTED = {
+    States.ENTRANCE: 'Root element can either be an object or an array',
+    States.OBJECT_EXPECT_KEY: 'Object key must be a string',
+    States.OBJECT_EXPECT_COLON: 'Object key must be followed with a colon',
+    States.OBJECT_EXIT: 'Invalid end character for object',
+    States.ARRAY_EXIT: 'Invalid end character for array',
+}
+
+# states within a token, in which the state machine stops if
+# the source string is exhausted before the end of the token
+_TOKEN_STATES = frozenset([States.OBJECT_KEY, States.OBJECT_VALUE_STRING, States.OBJECT_VALUE_IDENTIFIER,
+                           States.ARRAY_STRING, States.ARRAY_IDENTIFIER])
+
+
+class _SourceExhausted(Exception):
+    """The source string is exhausted in the state of
+    the first argument but more may be fed."""
+
+
+class _RootClosed(Exception):
+    """The root element, the first argument, is complete."""
+
+
 class Parser:
     """
     JSON parser.
@@ -54,9 +147,12 @@ class Parser:
 
     element_set = (JSONObject, JSONArray)
 
-    def __init__(self, source_string, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    def __init__(self, source_string, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False,
+                 use_index=False, intern_table=None, numeric_arrays=None, instrument=None, limits=None):
         """
-        Initialise the parser from source string.
+        Initialise the parser from source string, or from UTF-8
+        bytes, bytearray, memoryview or memory map of a file,
+        which is scanned byte by byte and decoded token by token.
 
         :param allow_nan: when set to True, NaN would
             be converted to convert_nan_to, by default
@@ -65,390 +161,701 @@ class Parser:
         :param allow_inf: when set to True, Inf and
             -Inf would be converted to corresponding
             python floating point number
+        :param use_index: when set to True, the structural
+            chars are indexed in a first pass and tokens are
+            scanned up to the next indexed char
+        :param intern_table: InternTable through which repeated
+            keys, short strings, numbers and optionally small
+            subtrees are shared
+        :param numeric_arrays: when set to array or numpy, arrays
+            of numbers only are converted in bulk to array.array or
+            NumPy arrays, of integers if all numbers are integers
+            and of floats otherwise. Only python dict and list are
+            built with it.
+        :param instrument: when set to True, the state machine
+            is instrumented and a ParseStats is kept in stats,
+            when set to a ParseStats, it is kept in stats and
+            the counts and timings of each parse are added to it,
+            and when set to a function, it is also called with
+            the ParseStats after each parse. Nothing is counted
+            otherwise.
+        :param limits: ParseLimits checked while scanning, the
+            parse being aborted with JSONLimitError at the first
+            one exceeded. Nothing is limited otherwise.
         """
+        if isinstance(source_string, memoryview):
+            # index the bytes whatever the format of the view
+            source_string = source_string.cast('B')
         self._source = source_string
-        self.__pos = -1
-        self.__line_no = 1
-        self.__char_no = 0
+        self._pos = 0
         self._allow_nan, self._convert_nan_to, self._allow_inf = allow_nan, convert_nan_to, allow_inf
 
-    def get_char(self, move_cursor=False):
-        """Get next char from source string."""
-        if move_cursor:
-            self.__pos += 1
-            self.__char_no += 1
+        # line and column numbers, counted from 0, at which the
+        # source string starts after its consumed part is dropped,
+        # see _append_source
+        self._line_base = 0
+        self._column_base = 0
+
+        # index of the structural chars and the position in it
+        self._use_index = use_index
+        self._index = None
+        self._entry = 0
+
+        # whether the source string is complete
+        self._final = True
+
+        self.intern_table = intern_table
+        self.limits = limits
+
+        if numeric_arrays is not None:
+            check_kind(numeric_arrays)
+        self._numeric_arrays = numeric_arrays
+
+        # statistics, the turns to each state being counted by
+        # the values of the states until the end of a parse
+        self.stats = None
+        self._stats_callback = None
+        self._transitions = None
+        if instrument:
+            self.stats = instrument if isinstance(instrument, ParseStats) else ParseStats()
+            if callable(instrument):
+                self._stats_callback = instrument
+            self._transitions = dict.fromkeys(STATE_NAMES, 0)
+
+        # a source of UTF-8 bytes is scanned as it is
+        # and only the tokens are decoded
+        self._is_bytes = not isinstance(source_string, str)
+
+    def _char_at(self, pos):
+        """Get the char at pos, decoding it from source bytes,
+        or an empty string at the end of the source."""
+        source = self._source
+        if pos >= len(source):
+            return ''
+        if not self._is_bytes:
+            return source[pos]
+        code = source[pos]
+        if code < 0x80:
+            return chr(code)
+        size = 2 if code < 0xe0 else 3 if code < 0xf0 else 4
+        return str(bytes(source[pos:pos + size]), 'utf-8', 'replace')
+
+    def _locate(self, pos):
+        """Get the line and column number of the char at pos, counting
+        chars rather than bytes, from the start of all that was fed.
+        They are only worked out when an error is raised."""
+        source = self._source
+        if self._is_bytes:
+            consumed = str(bytes(source[:pos]), 'utf-8', 'replace')
+            return locate(consumed + self._char_at(pos), len(consumed))
+        line_no, char_no = locate(source, pos)
+        if max(source.rfind('\n', 0, pos + 1), source.rfind('\r', 0, pos + 1)) < 0:
+            char_no += self._column_base
+        return self._line_base + line_no, char_no
+
+    def _syntax_error(self, pos, message, error_type=JSONSyntaxError):
+        """Create the syntax error of the char at pos."""
+        line_no, char_no = self._locate(pos)
+        return error_type(self._char_at(pos), line_no, char_no, message)
+
+    def _limit_error(self, pos, name):
+        """Create the error of the limit of name exceeded at pos."""
+        return self._syntax_error(pos, 'Exceeded %s of %d' % (name, getattr(self.limits, name)), JSONLimitError)
+
+    def _check_size(self, size):
+        """Raise JSONLimitError if size, the length of all of the source, is more than max_bytes."""
+        max_bytes = self.limits.max_bytes
+        if max_bytes is not None and size > max_bytes:
+            raise self._limit_error(len(self._source) - (size - max_bytes), 'max_bytes')
+
+    def _decode(self, start, end):
+        """Decode the bytes of source in [start, end)."""
         try:
-            char = self._source[self.__pos]
-            if move_cursor:
-                if char in '\r\n':
-                    self.__line_no += 1
-                    self.__char_no = 0
-            return char
+            return str(self._source[start:end], 'utf-8')
+        except UnicodeDecodeError as error:
+            line_no, char_no = self._locate(start + error.start)
+            raise JSONSyntaxError('\\x%02x' % error.object[error.start], line_no, char_no,
+                                  'Invalid UTF-8 byte in source')
+
+    def _append_source(self, chunk):
+        """Drop the consumed part of the source string, keeping the line
+        and column numbers it ends at, and append chunk to it."""
+        source, pos = self._source, self._pos
+        new_lines = source.count('\n', 0, pos) + source.count('\r', 0, pos)
+        if new_lines:
+            self._line_base += new_lines
+            self._column_base = pos - 1 - max(source.rfind('\n', 0, pos), source.rfind('\r', 0, pos))
+        else:
+            self._column_base += pos
+        self._source = ''.join([source[pos:], chunk])
+        self._pos = 0
+
+    def _next_entry(self, pos):
+        """Get the offset of the first indexed char from pos on."""
+        index = self._index
+        entry = self._entry
+        try:
+            while index[entry] < pos:
+                entry += 1
         except IndexError:
-            raise JSONSyntaxError('', self.__line_no, self.__char_no,
-                                  'No root element found before the end of the file')
-
-    def parse(self):
-        """Parse the source JSON string."""
-        # state
-        _STATE = States.ENTRANCE
-
-        # char pool
-        char_pool = []
-
-        # stacks
-        container_stack = Stack()
-        content_stack = Stack()
-
-        # whether to ignore space
-        _IGNORE_SPACE = True
-
-        # whether to move cursor
-        _MOVE_CURSOR = True
-
-        # whether to preserve raw char
-        _PRESERVE_RAW = False
-
-        # the core state machine
-        while True:
-
-            # get next char and set default _MOVE_CURSOR
-            char = self.get_char(_MOVE_CURSOR)
-            _MOVE_CURSOR = True
-
-            # skip space and new line separator if _IGNORE_SPACE is True
-            if (char.isspace() or char in '\r\n') and _IGNORE_SPACE:
-                continue
-
-            # ENTRANCE turns either to OBJECT_INITIAL or ARRAY_INITIAL
-            # depending on which char it finds, { or [.
-            if _STATE == States.ENTRANCE:
-                if char == '{':
-                    _STATE = States.OBJECT_INITIAL
-                    _MOVE_CURSOR = False
-                elif char == '[':
-                    _STATE = States.ARRAY_INITIAL
-                    _MOVE_CURSOR = False
-                else:
-                    raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                          'Root element can either be an object or an array')
-
-            # OBJECT_INITIAL creates a JSONObject, pushes it to
-            # the container stack and set its content stack as
-            # the current one. Then it turns to OBJECT_EXPECT_KEY.
-            elif _STATE == States.OBJECT_INITIAL:
-                new_object = JSONObject()
-                container_stack.push(new_object)
-                content_stack = new_object.content_stack
-                _STATE = States.OBJECT_EXPECT_KEY
-
-            # OBJECT_EXPECT_KEY expects a " as the beginning of a key
-            # and turns to OBJECT_KEY if it finds one. Specially,
-            # if a } is found, it turns to OBJECT_EXIT without
-            # moving the cursor directly.
-            # _IGNORE_SPACE is set to False if a " is found.
-            elif _STATE == States.OBJECT_EXPECT_KEY:
-                if char == '"':
-                    _STATE = States.OBJECT_KEY
-                    _IGNORE_SPACE = False
-                elif char == '}':
-                    _STATE = States.OBJECT_EXIT
-                    _MOVE_CURSOR = False
-                else:
-                    raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                          'Object key must be a string')
-
-            # OBJECT_KEY expects a string to be the key.
-            # All char will be put into the char pool
-            # and when " is found, the string is created.
-            # Then it creates a JSONKVPair and set the string
-            # as its key, push the K-V pair to content stack
-            # and turn to OBJECT_COLON.
-            # _IGNORE_SPACE is set to True thus.
-            elif _STATE == States.OBJECT_KEY:
-                if _PRESERVE_RAW:
-                    char_pool.append(char)
-                    _PRESERVE_RAW = False
-                    continue
-                if char != '"':
-                    if char == '\\' and not _PRESERVE_RAW:
-                        _PRESERVE_RAW = True
-                        continue
-                    char_pool.append(char)
-                else:
-                    kv_pair = JSONKVPair()
-                    kv_pair.key = ''.join(char_pool)
-                    content_stack.push(kv_pair)
-                    char_pool = []
-                    _STATE = States.OBJECT_EXPECT_COLON
-                    _IGNORE_SPACE = True
-
-            # OBJECT_EXPECT_COLON expects a : between a key and
-            # its value and turns to OBJECT_VALUE if found.
-            elif _STATE == States.OBJECT_EXPECT_COLON:
-                if char == ':':
-                    _STATE = States.OBJECT_EXPECT_VALUE
-                else:
-                    raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                          'Object key must be followed with a colon')
-
-            # OBJECT_EXPECT_VALUE expects a string, an object, an
-            # array or an identifier and turns to OBJECT_VALUE_STRING,
-            # OBJECT_INITIAL, ARRAY_INITIAL or OBJECT_VALUE_IDENTIFIER
-            # correspondingly.
-            # _IGNORE_SPACE is set to False if a string is found.
-            elif _STATE == States.OBJECT_EXPECT_VALUE:
-                if char == '{':
-                    _STATE = States.OBJECT_INITIAL
-                    _MOVE_CURSOR = False
-                elif char == '[':
-                    _STATE = States.ARRAY_INITIAL
-                    _MOVE_CURSOR = False
-                elif char == '"':
-                    _STATE = States.OBJECT_VALUE_STRING
-                    _IGNORE_SPACE = False
-                else:
-                    _STATE = States.OBJECT_VALUE_IDENTIFIER
-                    _MOVE_CURSOR = False
-
-            # OBJECT_VALUE_STRING expects a string to be the value of
-            # last K-V pair. When found is set the string to be the value
-            # and turns to OBJECT_EXIT.
-            # _IGNORE_SPACE is set to True afterwards.
-            elif _STATE == States.OBJECT_VALUE_STRING:
-                if _PRESERVE_RAW:
-                    char_pool.append(char)
-                    _PRESERVE_RAW = False
-                    continue
-                if char == '"':
-                    content_stack.peek().value = ''.join(char_pool)
-                    char_pool = []
-                    _STATE = States.OBJECT_EXIT
-                    _IGNORE_SPACE = True
-                else:
-                    if char == '\\' and not _PRESERVE_RAW:
-                        _PRESERVE_RAW = True
-                        continue
-                    char_pool.append(char)
-
-            # OBJECT_VALUE_IDENTIFIER expects an identifier or a number.
-            # If found then it push that identifier or number to the
-            # content stack. Then it turns to OBJECT_EXIT without moving
-            # the cursor.
-            elif _STATE == States.OBJECT_VALUE_IDENTIFIER:
-                if char not in ',}':
-                    char_pool.append(char)
-                else:
-                    raw_identifier_string = ''.join(char_pool)
-                    char_pool = []
-                    if raw_identifier_string in JSONIdentifier.IDENTIFIER_SET:
-                        content_stack.peek().value = JSONIdentifier.IDENTIFIER_TO_PYTHON_DICT[raw_identifier_string]
-                    elif raw_identifier_string.lower() in JSONIdentifier.EXTENDED_FLOAT_NUMBERS:
-                        raw_identifier_string = raw_identifier_string.lower()
-                        if raw_identifier_string == 'nan':
-                            if self._allow_nan:
-                                content_stack.peek().value = self._convert_nan_to
-                            else:
-                                raise JSONNonStandardElementError(char, self.__line_no, self.__char_no,
-                                                                  'JSON standard does not include NaN')
-                        else:
-                            if self._allow_inf:
-                                content_stack.peek().value = \
-                                    JSONIdentifier.EXTENDED_FLOAT_NUMBERS_TO_PYTHON[raw_identifier_string]
-                            else:
-                                raise JSONNonStandardElementError(char, self.__line_no, self.__char_no,
-                                                                  'JSON standard does not include Inf')
-                    else:
-                        try:
-                            number = int(raw_identifier_string)
-                        except ValueError:
-                            try:
-                                number = float(raw_identifier_string)
-                            except ValueError:
-                                raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                      'Unknown identifier *%s*' % raw_identifier_string)
-                        content_stack.peek().value = number
-                    _STATE = States.OBJECT_EXIT
-                    _MOVE_CURSOR = False
-
-            # OBJECT_EXIT expects either a , as the splitter or the
-            # end of the object. If a , is found, it turns to OBJECT_KEY.
-            # If a } is found, it first pops all content from the
-            # content stack and assigns them to the current object.
-            # Then it checks if there is any other container in the
-            # container stack. If not, it returns the current object
-            # as the root element. Otherwise, it assigns the current
-            # object to the last container in the container stack
-            # and set the content stack of that container to be the
-            # current one.
-            # If that last container in the container stack is an
-            # array, then it simply appends the object. Otherwise it
-            # sets the object as the key of the last K-V pair in the
-            # content stack of that container.
-            elif _STATE == States.OBJECT_EXIT:
-                if char == ',':
-                    _STATE = States.OBJECT_EXPECT_KEY
-                elif char == '}':
-                    object_ = container_stack.pop()
-                    object_.kv_pairs.extend(content_stack)
-                    if not container_stack.is_empty:
-                        last_container_in_stack = container_stack.peek()
-                        content_stack = last_container_in_stack.content_stack
-                        if isinstance(last_container_in_stack, JSONObject):
-                            if content_stack.peek().value is Undefined:
-                                content_stack.peek().value = object_
-                            else:
-                                raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                      'KVPair has already got a value')
-                        elif isinstance(last_container_in_stack, JSONArray):
-                            content_stack.push(object_)
-                            _STATE = States.ARRAY_EXIT
-                        else:
-                            raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                  'Unknown container type in the stack *%s*' %
-                                                  last_container_in_stack)
-                    else:
-                        return object_
-                else:
-                    raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                          'Invalid end character for object')
-
-            # ARRAY_INITIAL creates an JSONArray, pushes it to the
-            # container stack and set its content stack as the current
-            # one. Then it turns to ARRAY_ITEM.
-            elif _STATE == States.ARRAY_INITIAL:
-                new_array = JSONArray()
-                container_stack.push(new_array)
-                content_stack = new_array.content_stack
-                _STATE = States.ARRAY_EXPECT_ITEM
-
-            # ARRAY_EXPECT_ITEM expects a string, an object, an array or
-            # an identifier and turns to ARRAY_STRING, OBJECT_INITIAL,
-            # ARRAY_INITIAL oor ARRAY_IDENTIFIER correspondingly. If a [
-            # is found, it turns to ARRAY_EXIT directly.
-            elif _STATE == States.ARRAY_EXPECT_ITEM:
-                if char == '"':
-                    _STATE = States.ARRAY_STRING
-                    _IGNORE_SPACE = False
-                elif char == '{':
-                    _STATE = States.OBJECT_INITIAL
-                    _MOVE_CURSOR = False
-                elif char == '[':
-                    _STATE = States.ARRAY_INITIAL
-                    _MOVE_CURSOR = False
-                elif char == ']':
-                    _STATE = States.ARRAY_EXIT
-                    _MOVE_CURSOR = False
-                else:
-                    _STATE = States.ARRAY_IDENTIFIER
-                    _MOVE_CURSOR = False
-
-            # ARRAY_STRING expects a string. All char will be stored
-            # in the char pool and when a " is found, the string is
-            # created and pushed to content stack. Then it turns to
-            # ARRAY_EXIT.
-            elif _STATE == States.ARRAY_STRING:
-                if _PRESERVE_RAW:
-                    char_pool.append(char)
-                    _PRESERVE_RAW = False
-                    continue
-                if char == '"':
-                    string = ''.join(char_pool)
-                    content_stack.push(string)
-                    char_pool = []
-                    _STATE = States.ARRAY_EXIT
-                    _IGNORE_SPACE = True
-                else:
-                    if char == '\\' and not _PRESERVE_RAW:
-                        _PRESERVE_RAW = True
-                        continue
-                    char_pool.append(char)
-
-            # ARRAY_IDENTIFIER expects an identifier or a number.
-            # If found then it push that identifier or number to
-            # the content stack. Then it turns to ARRAY_EXIT without
-            # moving the cursor.
-            elif _STATE == States.ARRAY_IDENTIFIER:
-                if char not in ',]':
-                    char_pool.append(char)
-                else:
-                    raw_identifier_string = ''.join(char_pool)
-                    char_pool = []
-                    if raw_identifier_string in JSONIdentifier.IDENTIFIER_SET:
-                        content_stack.push(JSONIdentifier.IDENTIFIER_TO_PYTHON_DICT[raw_identifier_string])
-                    elif raw_identifier_string.lower() in JSONIdentifier.EXTENDED_FLOAT_NUMBERS:
-                        raw_identifier_string = raw_identifier_string.lower()
-                        if raw_identifier_string == 'nan':
-                            if self._allow_nan:
-                                content_stack.push(self._convert_nan_to)
-                            else:
-                                raise JSONNonStandardElementError(char, self.__line_no, self.__char_no,
-                                                                  'JSON standard does not include NaN')
-                        else:
-                            if self._allow_inf:
-                                content_stack.push(
-                                    JSONIdentifier.EXTENDED_FLOAT_NUMBERS_TO_PYTHON[raw_identifier_string]
-                                )
-                            else:
-                                raise JSONNonStandardElementError(char, self.__line_no, self.__char_no,
-                                                                  'JSON standard does not include Inf')
-                    else:
-                        try:
-                            number = int(raw_identifier_string)
-                        except ValueError:
-                            try:
-                                number = float(raw_identifier_string)
-                            except ValueError:
-                                raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                      'Unknown identifier *%s*' % raw_identifier_string)
-                        content_stack.push(number)
-                    _STATE = States.ARRAY_EXIT
-                    _MOVE_CURSOR = False
-
-            # ARRAY_EXIT expects either a , or a ]. The former one
-            # results in turning to ARRAY_ITEM. The latter one, as
-            # very similar to OBJECT_EXIT, first assign all content
-            # in the content stack to current container. Then it checks
-            # whether there is still containers in the container stack.
-            # If so, it assigns current container to the last containers
-            # in the stack as its content and set the content stack of
-            # that container as the current one. Otherwise it just
-            # return the current array as the root element.
-            # If the last container in the stack is an object, the
-            # current array will be assigned to the value of the last
-            # K-V pair in the content stack of the container. If it is
-            # an array, then the current array will just be simply pushed
-            # to the content stack of the container.
-            elif _STATE == States.ARRAY_EXIT:
-                if char == ',':
-                    _STATE = States.ARRAY_EXPECT_ITEM
-                elif char == ']':
-                    array_ = container_stack.pop()
-                    array_.array.extend(content_stack.reversed())
-                    if not container_stack.is_empty:
-                        last_container_in_stack = container_stack.peek()
-                        content_stack = last_container_in_stack.content_stack
-                        if isinstance(last_container_in_stack, JSONObject):
-                            if content_stack.peek().value is Undefined:
-                                content_stack.peek().value = array_
-                                _STATE = States.OBJECT_EXIT
-                            else:
-                                raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                      'KVPair has already got a value')
-                        elif isinstance(last_container_in_stack, JSONArray):
-                            content_stack.push(array_)
-                        else:
-                            raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                                  'Unknown container type in the stack *%s*' %
-                                                  last_container_in_stack)
-                    else:
-                        return array_
-                else:
-                    raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                          'Invalid end character for array')
+            self._entry = entry
+            return len(self._source)
+        self._entry = entry
+        return index[entry]
+
+    def _unescape(self, raw_string, pos):
+        """Decode the escapes in the raw content of a string
+        closed at pos, which are kept until it is closed."""
+        try:
+            return unescape(raw_string)
+        except ValueError as error:
+            raise self._syntax_error(pos, str(error))
+
+    def _parse_identifier(self, raw_identifier_string, pos):
+        """Convert an identifier or a number ended at pos to python."""
+        if raw_identifier_string in JSONIdentifier.IDENTIFIER_SET:
+            return JSONIdentifier.IDENTIFIER_TO_PYTHON_DICT[raw_identifier_string]
+        elif raw_identifier_string.lower() in JSONIdentifier.EXTENDED_FLOAT_NUMBERS:
+            raw_identifier_string = raw_identifier_string.lower()
+            if raw_identifier_string == 'nan':
+                if self._allow_nan:
+                    return self._convert_nan_to
+                raise self._syntax_error(pos, 'JSON standard does not include NaN', JSONNonStandardElementError)
+            if self._allow_inf:
+                return JSONIdentifier.EXTENDED_FLOAT_NUMBERS_TO_PYTHON[raw_identifier_string]
+            raise self._syntax_error(pos, 'JSON standard does not include Inf', JSONNonStandardElementError)
+        try:
+            return int(raw_identifier_string)
+        except ValueError:
+            try:
+                return float(raw_identifier_string)
+            except ValueError:
+                raise self._syntax_error(pos, 'Unknown identifier *%s*' % raw_identifier_string)
+
+    def parse(self, build_tree=False):
+        """
+        Parse the source JSON string.
+
+        :param build_tree: when set to True, a tree of JSONObject
+            and JSONArray is built, otherwise python dict and list
+            are built directly
+        """
+        if build_tree and self._numeric_arrays is not None:
+            raise ValueError('Numeric arrays can only be converted when building python dict and list')
+        if self.limits is not None:
+            self._check_size(len(self._source))
+        if self._use_index:
+            self._index = build_index(self._source)
+            self._entry = 0
+        self._start(build_tree)
+        if self.stats is None:
+            return self._run()
+
+        stats = self.stats
+        tokenise_time = stats.timings['tokenise']
+        start = time.perf_counter()
+        root = self._run()
+        stats.timings['build'] += time.perf_counter() - start - (stats.timings['tokenise'] - tokenise_time)
+        stats.tokens['object' if isinstance(root, self._object_type) else 'array'] += 1
+        stats.consumed += self._pos
+        for state, count in self._transitions.items():
+            if count:
+                name = STATE_NAMES[state]
+                stats.transitions[name] = stats.transitions.get(name, 0) + count
+        self._transitions = dict.fromkeys(STATE_NAMES, 0)
+        if self._stats_callback is not None:
+            self._stats_callback(stats)
+        return root
+
+    def _instrument(self, hooks, handlers):
+        """
+        Wrap the hooks of the state machine, which are the
+        converters of keys, strings and identifiers, the sharer
+        of closed containers, the token scanners and the numeric
+        array matcher, with counters and timers, and the handlers
+        with counters of the turns to the states they work in.
+
+        :param hooks: the hooks, the first three of which may be None
+        :param handlers: dict of the handlers by their names, which
+            are replaced in it
+        :return: the wrapped hooks in the same order
+        """
+        intern_key, intern_string, share_subtree, parse_identifier, scan_string, scan_identifier, match_numeric = hooks
+        tokens, timings = self.stats.tokens, self.stats.timings
+        transitions = self._transitions
+        object_type = self._object_type
+        perf_counter = time.perf_counter
+
+        def count_key(key):
+            tokens['key'] += 1
+            return key if intern_key is None else intern_key(key)
+
+        def count_string(string):
+            tokens['string'] += 1
+            return string if intern_string is None else intern_string(string)
+
+        def count_container(container):
+            tokens['object' if isinstance(container, object_type) else 'array'] += 1
+            return container if share_subtree is None else share_subtree(container)
+
+        def count_identifier(raw_identifier_string, pos):
+            value = parse_identifier(raw_identifier_string, pos)
+            tokens['literal' if value is True or value is False or value is None else 'number'] += 1
+            return value
+
+        def time_scan(scan):
+            def timed_scan(start):
+                started = perf_counter()
+                try:
+                    return scan(start)
+                finally:
+                    timings['tokenise'] += perf_counter() - started
+            return timed_scan
+
+        def time_numeric_array(source, pos, kind):
+            start = perf_counter()
+            numeric_array = match_numeric(source, pos, kind)
+            timings['tokenise'] += perf_counter() - start
+            if numeric_array is not None:
+                tokens['numeric_array'] += 1
+            return numeric_array
+
+        def count_turns(handler, state):
+            def counted_handler():
+                transitions[state] += 1
+                return handler()
+            return counted_handler
+
+        for name, state in _HANDLER_STATES.items():
+            handlers[name] = count_turns(handlers[name], state)
+
+        return (count_key, count_string, count_container, count_identifier, time_scan(scan_string),
+                time_scan(scan_identifier), time_numeric_array)
+
+    def _start(self, build_tree, events=False):
+        """Set the state machine to its initial state."""
+        # container types, all support container[key] = value
+        # for objects and container.append(item) for arrays
+        if events:
+            self._object_type, self._array_type = EventObject, EventArray
+        elif build_tree:
+            self._object_type, self._array_type = JSONObject, JSONArray
+        else:
+            self._object_type, self._array_type = dict, list
+
+        # list of (path, event, value) if events are produced
+        # instead of containers
+        self._events = [] if events else None
+
+        # state and offset of the next char to dispatch on
+        self._state = States.ENTRANCE
+        self._pos = 0
+
+        # char pool, keeping the part of a token before
+        # the end of the source string
+        self._char_pool = []
+
+        # the current container and the current key in it
+        self._container = None
+        self._key = None
+
+        # stacks of the enclosing containers and their keys
+        self._container_stack = []
+        self._key_stack = []
+
+        # numbers of the members or items of the open containers
+        # and of the elements in all, only counted if limited
+        self._item_counts = []
+        self._elements = 0
+
+    def _run(self):
+        """
+        Run the state machine from where it stopped.
+
+        Significant chars are looked up by their classes in the
+        transition table of the state the machine is in, and the
+        handler found there consumes the token the char starts,
+        if any, and returns the next state. Runs of space chars
+        are skipped in one step, and tokens are scanned in one
+        step each by the token scanners.
+
+        :return: the root element, or None if the source
+            string is exhausted before the root element is
+            complete and more of it may be fed
+        """
+        object_type, array_type = self._object_type, self._array_type
+        events = self._events
+        state = self._state
+        char_pool = self._char_pool
+        container, key = self._container, self._key
+        container_stack, key_stack = self._container_stack, self._key_stack
+        source = self._source
+        pos, size = self._pos, len(source)
+        final = self._final
+        is_bytes = self._is_bytes
+        decode = self._decode
+
+        OBJECT_KEY, OBJECT_EXPECT_KEY, OBJECT_EXPECT_COLON, OBJECT_EXPECT_VALUE, OBJECT_VALUE_STRING, \
+            OBJECT_VALUE_IDENTIFIER, OBJECT_EXIT, ARRAY_EXPECT_ITEM, ARRAY_STRING, ARRAY_IDENTIFIER, ARRAY_EXIT = \
+            States.OBJECT_KEY, States.OBJECT_EXPECT_KEY, States.OBJECT_EXPECT_COLON, States.OBJECT_EXPECT_VALUE, \
+            States.OBJECT_VALUE_STRING, States.OBJECT_VALUE_IDENTIFIER, States.OBJECT_EXIT, \
+            States.ARRAY_EXPECT_ITEM, States.ARRAY_STRING, States.ARRAY_IDENTIFIER, States.ARRAY_EXIT
+
+        # converters of keys, strings and identifiers, and sharer
+        # of closed containers if they are interned
+        intern_table = self.intern_table
+        intern_key = intern_string = share_subtree = None
+        parse_identifier = self._parse_identifier
+        if intern_table is not None:
+            intern_key, intern_string = intern_table.key, intern_table.string
+            parse_identifier = partial(intern_table.number, convert=parse_identifier)
+            if intern_table.share_subtrees and object_type is dict:
+                share_subtree = intern_table.subtree
+
+        # kind of arrays of numbers only converted in bulk
+        numeric_arrays = self._numeric_arrays if object_type is dict else None
+
+        # token scanners, which look up the index if there is one,
+        # returning the offset of the closing " of a string, or else
+        # of the end of its run of plain chars and escapes, and of
+        # the char ending an identifier
+        if self._index is not None:
+            scan_string = scan_identifier = self._next_entry
+        else:
+            string_run = (_BYTES_STRING_RUN if is_bytes else _STRING_RUN).match
+            identifier_stop = (_BYTES_IDENTIFIER_STOP if is_bytes else _IDENTIFIER_STOP).search
+
+            def scan_string(start):
+                return string_run(source, start).end()
+
+            def scan_identifier(start):
+                match = identifier_stop(source, start)
+                return size if match is None else match.start()
+        match_numeric = match_numeric_array
+
+        classes = _BYTE_CLASSES if is_bytes else _CHAR_CLASSES
+        non_space = (_BYTES_NON_SPACE if is_bytes else _NON_SPACE).search
+        quote = 0x22 if is_bytes else '"'
+
+        def exhausted(token_state, start, end):
+            """Stop within the token starting at start as the source string is
+            exhausted at end, keeping the part of it before end in the char pool."""
+            nonlocal pos
+            if final:
+                raise self._syntax_error(size, 'No root element found before the end of the file')
+            char_pool.append(source[start:end])
+            pos = end
+            raise _SourceExhausted(token_state)
+
+        def string(token_state):
+            """Consume a string from pos on, the opening " being
+            consumed already, and decode it."""
+            nonlocal pos
+            start = pos
+            end = scan_string(start)
+            # a run not followed by " ends at the end of the source or at a \ before it
+            if end >= size or source[end] != quote:
+                exhausted(token_state, start, end)
+            pos = end + 1
+            value = decode(start, end) if is_bytes else source[start:end]
+            if char_pool:
+                char_pool.append(value)
+                value = ''.join(char_pool)
+                char_pool.clear()
+            if '\\' in value:
+                value = self._unescape(value, end)
+            return value
+
+        def identifier(start, token_state):
+            """Consume an identifier or a number from start up to the
+            char ending it, which is left to dispatch on, and convert it."""
+            nonlocal pos
+            end = scan_identifier(start)
+            if end >= size:
+                exhausted(token_state, start, end)
+            pos = end
+            raw_identifier_string = decode(start, end) if is_bytes else source[start:end]
+            if char_pool:
+                char_pool.append(raw_identifier_string)
+                raw_identifier_string = ''.join(char_pool)
+                char_pool.clear()
+            return parse_identifier(raw_identifier_string.strip(), end)
+
+        def attach(element):
+            """Set a complete element as the value of the current key or append it to the
+            current array and return the state after it, or stop if it is the root element."""
+            if container is None:
+                raise _RootClosed(element)
+            if isinstance(container, object_type):
+                container[key] = element
+                return OBJECT_EXIT
+            container.append(element)
+            return ARRAY_EXIT
+
+        # the handlers, all of which are called with the char
+        # dispatched on consumed and return the next state
+
+        def open_object():
+            nonlocal container
+            if container is not None:
+                container_stack.append(container)
+                key_stack.append(key)
+            if events is None:
+                container = object_type()
             else:
-                raise JSONSyntaxError(char, self.__line_no, self.__char_no,
-                                      'Unknown state *%s*' % _STATE)
+                prefix = '' if container is None else container.child_prefix(key)
+                container = object_type(prefix, events)
+                events.append((prefix, 'start_map', None))
+            return OBJECT_EXPECT_KEY
+
+        def object_key():
+            nonlocal key
+            key = string(OBJECT_KEY)
+            if intern_key is not None:
+                key = intern_key(key)
+            if events is not None:
+                events.append((container.prefix, 'map_key', key))
+            return OBJECT_EXPECT_COLON
+
+        def colon():
+            return OBJECT_EXPECT_VALUE
+
+        def object_string():
+            value = string(OBJECT_VALUE_STRING)
+            container[key] = value if intern_string is None else intern_string(value)
+            return OBJECT_EXIT
+
+        def object_identifier():
+            container[key] = identifier(pos - 1, OBJECT_VALUE_IDENTIFIER)
+            return OBJECT_EXIT
+
+        def next_key():
+            return OBJECT_EXPECT_KEY
+
+        def close_object():
+            nonlocal container, key
+            object_ = container
+            if events is not None:
+                events.append((container.prefix, 'end_map', None))
+            if not container_stack:
+                raise _RootClosed(object_)
+            if share_subtree is not None:
+                object_ = share_subtree(object_)
+            container = container_stack.pop()
+            key = key_stack.pop()
+            return attach(object_)
+
+        # if numeric arrays are converted and the whole array is of
+        # numbers only, it is converted in one step and treated as
+        # a closed array
+        def open_array():
+            nonlocal pos, container
+            if numeric_arrays is not None:
+                numeric_array = match_numeric(source, pos - 1, numeric_arrays)
+                if numeric_array is not None:
+                    array_, end = numeric_array
+                    pos = end + 1
+                    return attach(array_)
+            if container is not None:
+                container_stack.append(container)
+                key_stack.append(key)
+            if events is None:
+                container = array_type()
+            else:
+                prefix = '' if container is None else container.child_prefix(key)
+                container = array_type(prefix, events)
+                events.append((prefix, 'start_array', None))
+            return ARRAY_EXPECT_ITEM
+
+        def array_string():
+            value = string(ARRAY_STRING)
+            container.append(value if intern_string is None else intern_string(value))
+            return ARRAY_EXIT
+
+        def array_identifier():
+            container.append(identifier(pos - 1, ARRAY_IDENTIFIER))
+            return ARRAY_EXIT
+
+        def next_item():
+            return ARRAY_EXPECT_ITEM
+
+        def close_array():
+            nonlocal container, key
+            array_ = container
+            if events is not None:
+                events.append((container.prefix, 'end_array', None))
+            if not container_stack:
+                raise _RootClosed(array_)
+            if share_subtree is not None:
+                array_ = share_subtree(array_)
+            container = container_stack.pop()
+            key = key_stack.pop()
+            return attach(array_)
+
+        def unexpected():
+            raise self._syntax_error(pos - 1, _UNEXPECTED[state])
+
+        def space_lead():
+            # in a source of bytes, a multibyte space char is
+            # skipped and any other char is handled as of _OTHER
+            nonlocal pos
+            start = pos - 1
+            char = self._char_at(start)
+            if char.isspace():
+                pos = start + len(char.encode('utf-8'))
+                return state
+            return table[state][_OTHER]()
+
+        handlers = {'open_object': open_object, 'object_key': object_key, 'colon': colon,
+                    'object_string': object_string, 'object_identifier': object_identifier, 'next_key': next_key,
+                    'close_object': close_object, 'open_array': open_array, 'array_string': array_string,
+                    'array_identifier': array_identifier, 'next_item': next_item, 'close_array': close_array}
+
+        # checks of the limits around the handlers and the token
+        # scanners if there are any, see ParseLimits, the depth
+        # being the number of open containers
+        elements = self._elements
+        limits = self.limits
+        if limits is not None:
+            item_counts = self._item_counts
+            max_depth, max_string_length, max_container_items, max_total_elements = \
+                limits.max_depth, limits.max_string_length, limits.max_container_items, limits.max_total_elements
+
+            def add_items(start, count, in_container):
+                # count elements starting at start, which are items of the
+                # current container or, if not in_container, of a new one
+                nonlocal elements
+                elements += count
+                if max_total_elements is not None and elements > max_total_elements:
+                    raise self._limit_error(start, 'max_total_elements')
+                if in_container and item_counts:
+                    item_counts[-1] += count
+                    count = item_counts[-1]
+                if max_container_items is not None and count > max_container_items:
+                    raise self._limit_error(start, 'max_container_items')
+
+            def limit_item(handler):
+                def limited_handler():
+                    add_items(pos - 1, 1, True)
+                    return handler()
+                return limited_handler
+
+            def limit_open(handler):
+                def limited_handler():
+                    start = pos - 1
+                    if max_depth is not None and len(item_counts) >= max_depth:
+                        raise self._limit_error(start, 'max_depth')
+                    if count_items:
+                        add_items(start, 1, True)
+                    try:
+                        next_state = handler()
+                    except _RootClosed:
+                        if count_items:
+                            add_numbers(start)
+                        raise
+                    if next_state == OBJECT_EXPECT_KEY or next_state == ARRAY_EXPECT_ITEM:
+                        item_counts.append(0)
+                    elif count_items:
+                        add_numbers(start)
+                    return next_state
+                return limited_handler
+
+            def add_numbers(start):
+                # an array of numbers converted in one step ends before pos
+                numbers = source[start:pos] if not is_bytes else bytes(source[start:pos])
+                add_items(start, numbers.count(b',' if is_bytes else ',') + 1, False)
+
+            def limit_close(handler):
+                def limited_handler():
+                    item_counts.pop()
+                    return handler()
+                return limited_handler
+
+            # only the limits set are checked
+            count_items = max_container_items is not None or max_total_elements is not None
+            if count_items:
+                for name in ('object_string', 'object_identifier', 'array_string', 'array_identifier'):
+                    handlers[name] = limit_item(handlers[name])
+            if count_items or max_depth is not None:
+                for name in ('open_object', 'open_array'):
+                    handlers[name] = limit_open(handlers[name])
+                for name in ('close_object', 'close_array'):
+                    handlers[name] = limit_close(handlers[name])
+
+            # the part of a token kept in the char pool counts too,
+            # and an identifier is limited without the spaces around
+            if max_string_length is not None:
+                def limit_scan(scan, strip):
+                    def limited_scan(start):
+                        end = scan(start)
+                        length = end - start + sum(map(len, char_pool))
+                        if length > max_string_length and strip:
+                            length -= (end - start) - len(bytes(source[start:end]).strip() if is_bytes else
+                                                          source[start:end].strip())
+                        if length > max_string_length:
+                            raise self._limit_error(start, 'max_string_length')
+                        return end
+                    return limited_scan
+                scan_string, scan_identifier = limit_scan(scan_string, False), limit_scan(scan_identifier, True)
+
+        # counters and timers around all of the above if instrumented
+        if self._transitions is not None:
+            intern_key, intern_string, share_subtree, parse_identifier, scan_string, scan_identifier, \
+                match_numeric = self._instrument((intern_key, intern_string, share_subtree, parse_identifier,
+                                                  scan_string, scan_identifier, match_numeric), handlers)
+
+        # the transition table, the handler of each state
+        # and class of char indexed by both
+        table = {}
+        for table_state, row in _TRANSITIONS.items():
+            default = handlers[row[None]] if None in row else unexpected
+            table[table_state] = tuple([handlers[row[char_class]] if char_class in row else default
+                                        for char_class in range(_SPACE_LEAD)] + [space_lead])
+
+        # the core state machine, its state is saved when the
+        # source string is exhausted so that it can be resumed
+        # once more is fed
+        try:
+            if state in _TOKEN_STATES:
+                # finish the token the source string was exhausted within
+                if state == OBJECT_KEY:
+                    state = object_key()
+                elif state == OBJECT_VALUE_STRING:
+                    state = object_string()
+                elif state == ARRAY_STRING:
+                    state = array_string()
+                else:
+                    state = attach(identifier(pos, state))
+
+            while True:
+                try:
+                    char = source[pos]
+                except IndexError:
+                    break
+                char_class = classes.get(char, _OTHER)
+                if char_class == _SPACE:
+                    match = non_space(source, pos)
+                    if match is None:
+                        pos = size
+                        break
+                    pos = match.start()
+                    char_class = classes.get(source[pos], _OTHER)
+                pos += 1
+                state = table[state][char_class]()
+
+            if final:
+                raise self._syntax_error(size, 'No root element found before the end of the file')
+            raise _SourceExhausted(state)
+        except _RootClosed as closed:
+            self._pos = pos
+            return closed.args[0]
+        except _SourceExhausted as exhausted_in:
+            self._state = exhausted_in.args[0]
+            self._pos = pos
+            self._char_pool = char_pool
+            self._container, self._key = container, key
+            self._elements = elements
+            return None
 
     @staticmethod
     def from_python(python_dict_or_list):
@@ -459,3 +866,76 @@ class Parser:
             return JSONArray.from_python(python_dict_or_list)
         else:
             raise TypeError('Can only parse from python dict or list')
+
+
+class IncrementalParser(Parser):
+    """
+    JSON parser fed with the source string chunk by chunk.
+    """
+
+    def __init__(self, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False, build_tree=False,
+                 events=False, limits=None):
+        """
+        Initialise the parser with an empty source string.
+
+        :param allow_nan: when set to True, NaN would
+            be converted to convert_nan_to, by default
+            PY_FLOAT_NAN
+        :param convert_nan_to: what to convert NaN to
+        :param allow_inf: when set to True, Inf and
+            -Inf would be converted to corresponding
+            python floating point number
+        :param build_tree: when set to True, a tree of JSONObject
+            and JSONArray is built, otherwise python dict and list
+            are built directly
+        :param events: when set to True, no container is built
+            and (path, event, value) tuples are produced instead,
+            see read_events
+        :param limits: ParseLimits checked while scanning, see
+            Parser, max_bytes being checked against all that is
+            fed
+        """
+        super(IncrementalParser, self).__init__('', allow_nan, convert_nan_to, allow_inf, limits=limits)
+        self._final = False
+        self._fed = 0
+        self._start(build_tree, events)
+        self._root = None
+
+    def feed(self, chunk: str):
+        """Feed a chunk of the source string and parse as far as possible.
+        Anything after the root element is ignored."""
+        if self._root is None:
+            self._append_source(chunk)
+            if self.limits is not None:
+                self._fed += len(chunk)
+                self._check_size(self._fed)
+            self._root = self._run()
+
+    def close(self):
+        """Finish parsing and return the root element,
+        or None if events are produced instead."""
+        if self._root is None:
+            self._final = True
+            self._root = self._run()
+        return self._root if self._events is None else None
+
+    def read_events(self):
+        """
+        Iterate over the events produced from what has been fed
+        since the last call. Each event is a (path, event, value)
+        tuple, where event is one of start_map, map_key, end_map,
+        start_array, end_array, string, number, boolean and null.
+        """
+        events = self._events[:]
+        del self._events[:]
+        return iter(events)
+
+
+def parse_mapped_file(path, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+    """Parse a UTF-8 file from a read only memory map of it."""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            # empty files cannot be mapped
+            return Parser(b'', allow_nan, convert_nan_to, allow_inf).parse()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return Parser(mapped, allow_nan, convert_nan_to, allow_inf).parse()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Running tasks in a pool of processes.
+"""
+
+__author__ = 'Nb'
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+def count_workers(workers):
+    """Number of worker processes, all cores if workers is None."""
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('Number of workers must be positive, not *%s*' % workers)
+    return workers
+
+
+def map_tasks(function, tasks, workers, ordered=True):
+    """
+    Call function with the arguments of each task in a pool of
+    processes and yield the results. Tasks are taken lazily
+    from the iterable, at most twice as many as the workers
+    are in flight at a time. With a single worker everything
+    is run in the current process.
+
+    :param function: module level function, so that it can
+        be sent to the workers
+    :param tasks: iterable of argument tuples
+    :param workers: number of processes, all cores if None
+    :param ordered: when set to False, results are yielded
+        as soon as they are done instead of in task order
+    """
+    workers = count_workers(workers)
+    if workers == 1:
+        for arguments in tasks:
+            yield function(*arguments)
+        return
+
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        try:
+            yield from _drain(executor, function, tasks, pending, workers, ordered)
+        finally:
+            # do not wait for tasks nobody is interested in anymore
+            for future in pending:
+                future.cancel()
+
+
+def _drain(executor, function, tasks, pending, workers, ordered):
+    """Keep the executor busy and yield the results."""
+    for arguments in tasks:
+        pending.append(executor.submit(function, *arguments))
+        if len(pending) == workers * 2:
+            break
+    while pending:
+        if ordered:
+            done = [pending[0]]
+        else:
+            done = wait(pending, return_when=FIRST_COMPLETED).done
+        for future in done:
+            result = future.result()
+            pending.remove(future)
+            for arguments in tasks:
+                pending.append(executor.submit(function, *arguments))
+                break
+            yield result
@@ -0,0 +1,305 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Parsers specialised to the shape of a document.
+"""
+
+__author__ = 'Nb'
+
+import re
+
+from ._util import PY_FLOAT_NAN, JSONSyntaxError, JSONSchemaError
+from ._parser import Parser
+from ._lazy import skip_container, decode
+from ._numeric import _NUMBER, _NUMBER_ARRAY, _FLOAT_CHAR
+from ._escape import encode_string
+
+SCALAR_TYPES = ('int', 'float', 'number', 'string', 'bool', 'null', 'any')
+
+# typed token readers, the value being their first group,
+# and what the match is converted with
+_READERS = {
+    'int': (r'(-?(?:0|[1-9][0-9]*))(?![.eE0-9])', 'int(m.group(1))'),
+    'float': (r'(%s)' % _NUMBER, 'float(m.group(1))'),
+    'number': (r'(-?(?:0|[1-9][0-9]*)((?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?))',
+               'float(m.group(1)) if m.group(2) else int(m.group(1))'),
+    'string': (r'"([^"\\]*)"', 'm.group(1)'),
+    'bool': (r'(true|false)', "m.group(1) == 'true'"),
+    'null': (r'null', 'None'),
+}
+_SPACE = re.compile(r'\s*')
+_SCALAR = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s,\]}]+', re.S)
+
+
+class _Fallback(Exception):
+    """The document does not have the expected shape
+    and is parsed by the generic parser instead."""
+
+
+def normalise(schema):
+    """
+    Turn a schema into hashable nodes, which are ('object', ((key,
+    node), ...)), ('array', node) or ('scalar', type, nullable).
+
+    A schema is a dict of the keys of an object, in the order they
+    are expected in, to their schemas, a list of the schema of the
+    items of an array, or the name of a scalar type, one of int,
+    float, number, string, bool, null and any, with a trailing ?
+    if it may be null too.
+    """
+    if isinstance(schema, dict):
+        for key in schema:
+            if not isinstance(key, str):
+                raise TypeError('Object key must be a string, not *%s*' % key)
+        return 'object', tuple((key, normalise(value)) for key, value in schema.items())
+    elif isinstance(schema, list):
+        if len(schema) != 1:
+            raise ValueError('Array schema must have exactly one item schema, not %s' % len(schema))
+        return 'array', normalise(schema[0])
+    elif isinstance(schema, str):
+        name = schema[:-1] if schema.endswith('?') else schema
+        if name not in SCALAR_TYPES:
+            raise ValueError('Scalar type must be one of %s, not *%s*' % (', '.join(SCALAR_TYPES), schema))
+        return 'scalar', name, name != schema
+    raise TypeError('Schema must be a dict, list or str, not *%s*' % schema)
+
+
+class _Generator:
+    """
+    Generate the source of the readers of a schema, one function
+    per container reading it at pos, after any space, and returning
+    it with the offset after it. Whatever is not as expected raises
+    _Fallback.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.constants = {}
+        self.functions = 0
+
+    def constant(self, value):
+        """Name of a constant of the generated source."""
+        name = '_K%s' % len(self.constants)
+        self.constants[name] = value
+        return name
+
+    def pattern(self, pattern):
+        """Name of the match method of a compiled regex."""
+        return self.constant(re.compile(pattern).match)
+
+    def emit_match(self, lines, indent, pattern):
+        """Emit the match of pattern at pos, leaving it in m."""
+        lines.append('%sm = %s(s, pos)' % (indent, self.pattern(pattern)))
+        lines.append('%sif m is None:' % indent)
+        lines.append('%s    raise _Fallback' % indent)
+
+    def emit_value(self, lines, indent, node, target, prefix=None):
+        """
+        Emit reading the value of node at pos into target. The
+        prefix pattern before the value, if any, is matched in
+        the same regex as scalars which may not be null.
+        """
+        if node[0] == 'scalar':
+            _, name, nullable = node
+            if name != 'any' and (not nullable or name == 'null'):
+                pattern, conversion = _READERS[name]
+                self.emit_match(lines, indent, (prefix or '') + pattern)
+                lines.append('%s%s = %s' % (indent, target, conversion))
+                lines.append('%spos = m.end()' % indent)
+                return
+        if prefix is not None:
+            self.emit_match(lines, indent, prefix)
+            lines.append('%spos = m.end()' % indent)
+        if node[0] != 'scalar':
+            lines.append('%s%s, pos = %s(s, pos)' % (indent, target, self.function(node)))
+        elif name == 'any':
+            lines.append('%s%s, pos = _any(s, pos)' % (indent, target))
+        else:
+            lines.append("%sif s.startswith('null', pos):" % indent)
+            lines.append('%s    %s = None' % (indent, target))
+            lines.append('%s    pos += 4' % indent)
+            lines.append('%selse:' % indent)
+            self.emit_value(lines, indent + '    ', ('scalar', name, False), target)
+
+    def function(self, node):
+        """Emit the function reading a container, returning its name."""
+        name = '_read_%s' % self.functions
+        self.functions += 1
+        lines = ['def %s(s, pos):' % name]
+        if node[0] == 'object':
+            members = node[1]
+            separator = r'\{\s*'
+            for i, (key, value) in enumerate(members):
+                prefix = r'%s%s\s*:\s*' % (separator, re.escape(encode_string(key)))
+                self.emit_value(lines, '    ', value, 'v%s' % i, prefix)
+                separator = r'\s*,\s*'
+            self.emit_match(lines, '    ', r'\s*\}' if members else r'\{\s*\}')
+            lines.append('    return {%s}, m.end()' % ', '.join('%r: v%s' % (key, i)
+                                                             for i, (key, _) in enumerate(members)))
+        else:
+            item = node[1]
+            if item in (('scalar', 'int', False), ('scalar', 'float', False)):
+                # arrays of numbers only are converted in bulk
+                lines.append('    m = %s(s, pos)' % self.constant(_NUMBER_ARRAY.match))
+                lines.append('    if m is not None:')
+                lines.append('        numbers = m.group(1)')
+                if item[1] == 'int':
+                    lines.append('        if %s(numbers) is None:' % self.constant(_FLOAT_CHAR.search))
+                    lines.append("            return list(map(int, numbers.split(','))), m.end()")
+                else:
+                    lines.append("        return list(map(float, numbers.split(','))), m.end()")
+            self.emit_match(lines, '    ', r'\[\s*(\])?')
+            lines.append('    pos = m.end()')
+            lines.append('    items = []')
+            lines.append('    if m.lastindex:')
+            lines.append('        return items, pos')
+            lines.append('    append = items.append')
+            lines.append('    while True:')
+            self.emit_value(lines, '        ', item, 'item')
+            lines.append('        append(item)')
+            self.emit_match(lines, '        ', r'\s*(?:(,)\s*|\])')
+            lines.append('        pos = m.end()')
+            lines.append('        if m.lastindex is None:')
+            lines.append('            return items, pos')
+        self.lines.extend(lines)
+        self.lines.append('')
+        return name
+
+
+def _any(source, pos):
+    """
+    Read a value of any type at pos with the generic parser. NaN
+    and Inf are not allowed here, so that documents with them are
+    parsed with the options of the SchemaParser.
+    """
+    if pos == len(source):
+        raise _Fallback
+    elif source[pos] == '{' or source[pos] == '[':
+        end = skip_container(source, pos)
+    else:
+        match = _SCALAR.match(source, pos)
+        if match is None:
+            raise _Fallback
+        end = match.end()
+    return decode(source, pos, end, (False, PY_FLOAT_NAN, False)), end
+
+
+# compiled readers of normalised schemas, by the schema
+_COMPILED = {}
+
+
+def compile_reader(node):
+    """
+    Generate the source of the reader of the document of a
+    normalised schema and compile it, unless it already is.
+
+    :return: the reader, taking the whole source, and its source
+    """
+    compiled = _COMPILED.get(node)
+    if compiled is None:
+        if node[0] == 'scalar':
+            raise ValueError('Root element can either be an object or an array')
+        generator = _Generator()
+        root = generator.function(node)
+        generator.lines.append('def read(s):')
+        generator.lines.append('    return %s(s, %s(s, 0).end())[0]' % (root, generator.pattern(r'\s*')))
+        source = '\n'.join(generator.lines) + '\n'
+        namespace = dict(generator.constants, _Fallback=_Fallback, _any=_any)
+        exec(compile(source, '<schema>', 'exec'), namespace)
+        compiled = _COMPILED[node] = namespace['read'], source
+    return compiled
+
+
+def check(element, node, path='$'):
+    """
+    Check that a python element parsed by the generic parser has
+    the shape of a normalised schema, returning it with its object
+    keys in schema order and the integers of float fields converted.
+
+    :raise JSONSchemaError: if it has not
+    """
+    kind = node[0]
+    if kind == 'object':
+        if type(element) is not dict:
+            raise JSONSchemaError(path, 'Expected an object')
+        checked = {}
+        for key, value in node[1]:
+            if key not in element:
+                raise JSONSchemaError(path, 'Missing key *%s*' % key)
+            checked[key] = check(element[key], value, '%s.%s' % (path, key))
+        if len(checked) != len(element):
+            extra = next(key for key in element if key not in checked)
+            raise JSONSchemaError(path, 'Unexpected key *%s*' % extra)
+        return checked
+    elif kind == 'array':
+        if type(element) is not list:
+            raise JSONSchemaError(path, 'Expected an array')
+        return [check(item, node[1], '%s[%s]' % (path, i)) for i, item in enumerate(element)]
+    _, name, nullable = node
+    element_type = type(element)
+    if name == 'any' or element is None and (nullable or name == 'null'):
+        return element
+    elif name == 'int' and element_type is int or name == 'string' and element_type is str or \
+            name == 'bool' and element_type is bool or name == 'number' and element_type in (int, float):
+        return element
+    elif name == 'float' and element_type in (int, float):
+        return float(element)
+    raise JSONSchemaError(path, 'Expected %s, not *%s*' % (name, element))
+
+
+class SchemaParser:
+    """
+    Parser of documents of a fixed shape. The document is read by
+    generated code expecting the keys of objects in schema order
+    and reading each value with the token reader of its type, and
+    is parsed by the generic parser and checked against the schema
+    if it is not as expected, e.g. its keys are out of order or a
+    string has escapes. Either way, the parsed element matches the
+    schema or JSONSchemaError is raised.
+
+    The number of documents parsed by the generic parser is kept
+    in fallbacks.
+    """
+
+    def __init__(self, schema, allow_nan=False, convert_nan_to=PY_FLOAT_NAN, allow_inf=False):
+        """
+        Compile the parser of schema, see normalise. The options
+        only apply to documents parsed by the generic parser.
+        """
+        self.schema = schema
+        self._node = normalise(schema)
+        self._read, self.source = compile_reader(self._node)
+        self._options = allow_nan, convert_nan_to, allow_inf
+        self.fallbacks = 0
+
+    def __repr__(self):
+        return '<SchemaParser: %s, %s fallbacks>' % (self.schema, self.fallbacks)
+
+    def parse(self, source):
+        """Parse a document from string or UTF-8 bytes."""
+        if not isinstance(source, str):
+            source = bytes(source).decode('utf-8')
+        try:
+            return self._read(source)
+        except (_Fallback, JSONSyntaxError):
+            self.fallbacks += 1
+        return self.check(Parser(source, *self._options).parse())
+
+    def check(self, element):
+        """Check a parsed element against the schema, see check."""
+        return check(element, self._node)
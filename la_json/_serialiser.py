@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Serialisers walking python dict and list directly.
+"""
+
+__author__ = 'Nb'
+
+import sys
+from array import array
+
+from ._util import PY_FLOAT_INF, PY_FLOAT_NEG_INF, JSONNonStandardElementError
+from ._elements import JSONObject, JSONArray, JSONIdentifier
+from ._numeric import numpy
+from ._escape import encode_string, encode_ascii_string
+
+
+def _encode_float(item: float) -> str:
+    if item != item:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include NaN, cannot create non standard JSON string'
+        )
+    elif item == PY_FLOAT_INF or item == PY_FLOAT_NEG_INF:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include Inf, cannot create non standard JSON string'
+        )
+    return repr(item)
+
+
+# encoders of items which are not containers by their exact type
+_ENCODERS = {
+    str: encode_string,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: JSONIdentifier.PYTHON_TO_IDENTIFIER_DICT.__getitem__,
+    type(None): JSONIdentifier.PYTHON_TO_IDENTIFIER_DICT.__getitem__,
+}
+_ASCII_ENCODERS = {**_ENCODERS, str: encode_ascii_string}
+
+
+def _encode_item(item, encoders=_ENCODERS) -> str:
+    """Encode an item which is not a container."""
+    encoder = encoders.get(type(item))
+    if encoder is not None:
+        return encoder(item)
+    elif isinstance(item, str):
+        return encoders[str](item)
+    elif item != item:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include NaN, cannot create non standard JSON string'
+        )
+    elif item in [PY_FLOAT_INF, PY_FLOAT_NEG_INF]:
+        raise JSONNonStandardElementError(
+            message='JSON standard does not include Inf, cannot create non standard JSON string'
+        )
+    return JSONIdentifier.parse_python_keyword(item)
+
+
+def _members(container):
+    """Get the kind of a container and an iterator over its members,
+    which are K-V tuples for objects and items for arrays. Typed
+    arrays of numbers, see numeric_arrays of Parser, are arrays."""
+    if isinstance(container, dict):
+        return True, iter(container.items())
+    elif isinstance(container, list):
+        return False, iter(container)
+    elif isinstance(container, JSONObject):
+        return True, zip(container.key_array, container.value_array)
+    elif isinstance(container, JSONArray):
+        return False, iter(container.array)
+    elif isinstance(container, array):
+        return False, iter(container)
+    elif numpy is not None and isinstance(container, numpy.ndarray) and container.ndim:
+        # python numbers rather than NumPy ones
+        return False, iter(container.tolist())
+    return None, None
+
+
+def _walk(python_dict_or_list, pieces, flush_size, ensure_ascii=False):
+    """
+    Walk a python dict or list, or a JSONObject or JSONArray,
+    depth first with an explicit stack and append the pieces
+    of the JSON string to pieces, dispatching on the exact
+    type of each item. Yield whenever pieces holds flush_size
+    pieces or more, so that they can be taken out of it.
+
+    :param ensure_ascii: when set to True, non ASCII chars
+        in strings are escaped too
+    """
+    is_object, members = _members(python_dict_or_list)
+    if members is None:
+        raise TypeError('Can only parse from python dict or list')
+    append = pieces.append
+    append('{' if is_object else '[')
+    encoders = _ASCII_ENCODERS if ensure_ascii else _ENCODERS
+    encode_key = encoders[str]
+
+    # stack of (is_object, members) of the containers being walked,
+    # the last one is resumed once a nested one is done
+    stack = [(is_object, members)]
+    is_first = True
+    while stack:
+        is_object, members = stack[-1]
+        for member in members:
+            if len(pieces) >= flush_size:
+                yield
+            if is_first:
+                is_first = False
+            else:
+                append(', ')
+            if is_object:
+                key, item = member
+                if type(key) is not str and not isinstance(key, str):
+                    raise TypeError('Object key must be a string, not *%s*' % key)
+                append(encode_key(key) + ': ')
+            else:
+                item = member
+            encoder = encoders.get(type(item))
+            if encoder is not None:
+                append(encoder(item))
+                continue
+            item_type = type(item)
+            if item_type is dict:
+                stack.append((True, iter(item.items())))
+                append('{')
+            elif item_type is list:
+                stack.append((False, iter(item)))
+                append('[')
+            else:
+                is_item_object, item_members = _members(item)
+                if item_members is None:
+                    append(_encode_item(item, encoders))
+                    continue
+                stack.append((is_item_object, item_members))
+                append('{' if is_item_object else '[')
+            is_first = True
+            break
+        else:
+            stack.pop()
+            append('}' if is_object else ']')
+            is_first = False
+
+
+def encode(python_dict_or_list, ensure_ascii=False) -> str:
+    """Serialise to JSON string in one go. See _walk for ensure_ascii."""
+    pieces = []
+    for _ in _walk(python_dict_or_list, pieces, sys.maxsize, ensure_ascii):
+        pass
+    return ''.join(pieces)
+
+
+def iter_chunks(python_dict_or_list, chunk_size=65536, ensure_ascii=False):
+    """Serialise to JSON string in chunks of chunk_size chars,
+    except for the last one which may be shorter."""
+    pieces = []
+    rest = ''
+    # each piece being one char at least, chunk_size
+    # pieces make up one chunk at least
+    for _ in _walk(python_dict_or_list, pieces, chunk_size, ensure_ascii):
+        data = rest + ''.join(pieces)
+        pieces.clear()
+        end = len(data) - len(data) % chunk_size
+        for start in range(0, end, chunk_size):
+            yield data[start:start + chunk_size]
+        rest = data[end:]
+    data = rest + ''.join(pieces)
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -*- encoding: utf-8 -*-
+
+"""
+Copyright 2015 Nb<k.memo@live.cn>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Statistics of the parser at work.
+"""
+
+__author__ = 'Nb'
+
+import time
+from contextlib import contextmanager
+
+# phases timed, tokenise being the time in the token scanners
+# and build the rest of the state machine
+PHASES = ('tokenise', 'build', 'to_python', 'serialise')
+
+
+class ParseStats:
+    """
+    Counters and timings collected by an instrumented parser.
+
+    transitions maps the names of the states, see States, to
+    the number of times the state machine turned to them, tokens
+    maps key, string, number, literal, object, array and
+    numeric_array to their numbers, consumed is the number of
+    chars, or bytes for a source of bytes, which the parser went
+    through and timings maps the phases to seconds.
+    """
+
+    def __init__(self):
+        self.transitions = {}
+        self.tokens = dict.fromkeys(['key', 'string', 'number', 'literal', 'object', 'array', 'numeric_array'], 0)
+        self.consumed = 0
+        self.timings = dict.fromkeys(PHASES, 0.0)
+
+    @property
+    def containers(self):
+        """Number of objects and arrays created."""
+        return self.tokens['object'] + self.tokens['array'] + self.tokens['numeric_array']
+
+    @contextmanager
+    def timed(self, phase):
+        """Add the time spent in the with block to phase,
+        e.g. with stats.timed('to_python'): tree.to_python()"""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[phase] += time.perf_counter() - start
+
+    def as_dict(self):
+        """Convert the statistics to python dict."""
+        return {
+            'transitions': dict(self.transitions),
+            'tokens': dict(self.tokens),
+            'containers': self.containers,
+            'consumed': self.consumed,
+            'timings': dict(self.timings),
+        }
+
+    def __repr__(self):
+        return '<ParseStats: %s>' % self.as_dict()
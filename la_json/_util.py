@@ -82,6 +82,7 @@ class Stack:
 class JSONSyntaxError(SyntaxError):
     """JSON syntax error."""
     def __init__(self, char: str, line_no: int, char_no: int, message=None):
+        self.char, self.line_no, self.char_no, self.message = char, line_no, char_no, message
         self.msg = 'Error parsing *%s* at line %s, column %s: %s' % \
                    (char, line_no, char_no, message if message is not None else '')
         # On python 3.3 or higher, when __cause__ is set to
@@ -102,6 +103,19 @@ class JSONNonStandardElementError(JSONSyntaxError):
             super(JSONNonStandardElementError, self).__init__(char, line_no, char_no, message)
 
 
+class JSONLimitError(JSONSyntaxError):
+    """JSON source exceeding a limit of the parser, see ParseLimits."""
+
+
+class JSONSchemaError(JSONSyntaxError):
+    """JSON element not matching the schema it is parsed with."""
+
+    def __init__(self, path: str, message: str):
+        self.path = path
+        self.msg = 'Error matching schema at %s: %s' % (path, message)
+        self.__cause__ = None
+
+
 # extended floating point numbers
 try:
     PY_FLOAT_INF = float('inf')
@@ -112,3 +126,18 @@ except ValueError:
                                'Hardware may not be compatible with this software.')
     error.__cause__ = None
     raise error
+
+
+def locate(source: str, pos: int):
+    """Get the line and column number of the char at pos
+    the same way as the parser counts them."""
+    consumed = source[:pos + 1]
+    line_no = 1 + consumed.count('\n') + consumed.count('\r')
+    last_new_line = max(consumed.rfind('\n'), consumed.rfind('\r'))
+    return line_no, pos - last_new_line
+
+
+def syntax_error_at(source: str, pos: int, message: str):
+    """Create the syntax error of the char at pos."""
+    line_no, char_no = locate(source, pos)
+    return JSONSyntaxError(source[pos:pos + 1], line_no, char_no, message)
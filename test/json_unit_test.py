@@ -21,9 +21,22 @@ The parser.
 
 __author__ = 'Kevin'
 
+import asyncio
+import io
+import operator
+import os
+from array import array
+import tempfile
 import unittest
 
-from la_json import parse, serialise
+from la_json import parse, parse_file, parse_lazy, extract, serialise, iter_serialise, dump, iterparse, Parser, \
+    IncrementalParser, parse_lines, iter_lines, dump_lines, InternTable, ParseStats, parse_async, iterparse_async, \
+    dump_async, ParseCache, VIEW, compile_schema, parse_document, ParseLimits
+from la_json._elements import JSONObject, JSONArray
+from la_json._index import build_index
+from la_json._lazy import split_array
+from la_json._numeric import numpy
+from la_json._util import JSONSyntaxError, JSONSchemaError, JSONLimitError
 
 
 class JSONUnitTest(unittest.TestCase):
@@ -77,6 +90,451 @@ class JSONUnitTest(unittest.TestCase):
         })
         self.assertEqual(test_2_json, parse(serialise(test_2_json)))
 
+    def test_scan_tokens(self):
+        long_string = 'http://example.com/' + 'x' * 10000
+        self.assertEqual(parse('{"A\\"B": ["%s", "C\\\\"], "D": "%s\\""}' % (long_string, long_string)), {
+            'A"B': [long_string, 'C\\'],
+            'D': long_string + '"'
+        })
+        self.assertEqual(parse('[1, -2.5 ,\n true, null]'), [1, -2.5, True, None])
+        with self.assertRaises(JSONSyntaxError) as context:
+            parse('{"A": 1,\n "B": tru}')
+        self.assertEqual(context.exception.msg,
+                         'Error parsing *}* at line 2, column 10: Unknown identifier *tru*')
+        with self.assertRaises(JSONSyntaxError) as context:
+            parse('{"A":\n "B\nC')
+        self.assertEqual(context.exception.msg,
+                         'Error parsing ** at line 3, column 2: No root element found before the end of the file')
+
+    def test_build_tree(self):
+        with open('test_2.json') as f:
+            source = f.read()
+        tree = Parser(source).parse(build_tree=True)
+        self.assertIsInstance(tree, JSONObject)
+        self.assertIsInstance(tree.kv_pairs[1].value, JSONArray)
+        self.assertEqual([kv.key for kv in tree.kv_pairs], ['AAA', 'P"P', 'ESCAPE'])
+        self.assertEqual(tree.to_python(), Parser(source).parse())
+        self.assertEqual(parse(str(tree)), parse(source))
+        self.assertEqual(tree.key_array, ['AAA', 'P"P', 'ESCAPE'])
+        self.assertIs(tree.value_array[1], tree.kv_pairs[1].value)
+        self.assertRaises(AttributeError, getattr, tree.kv_pairs, 'append')
+        self.assertFalse(hasattr(tree, '__dict__') or hasattr(tree.value_array[1], '__dict__'))
+
+    def test_incremental_parse(self):
+        with open('test_1.json') as f:
+            source = f.read()
+        for chunk_size in (1, 2, 7, 64):
+            parser = IncrementalParser()
+            for i in range(0, len(source), chunk_size):
+                parser.feed(source[i:i + chunk_size])
+            self.assertEqual(parser.close(), parse(source))
+        parser = IncrementalParser()
+        parser.feed('{"A": [1, 2')
+        with self.assertRaises(JSONSyntaxError):
+            parser.close()
+        for chunk_size in (1, 3, 100):
+            source = '{"A": 1,\n "B":  tru}'
+            parser = IncrementalParser()
+            with self.assertRaises(JSONSyntaxError) as context:
+                for i in range(0, len(source), chunk_size):
+                    parser.feed(source[i:i + chunk_size])
+            self.assertEqual(context.exception.msg,
+                             'Error parsing *}* at line 2, column 11: Unknown identifier *tru*')
+
+    def test_iterparse(self):
+        self.assertEqual(list(iterparse('{"A": [1, "B", {"C": null}], "D": {"E": true}}', chunk_size=4)), [
+            ('', 'start_map', None),
+            ('', 'map_key', 'A'),
+            ('A', 'start_array', None),
+            ('A.item', 'number', 1),
+            ('A.item', 'string', 'B'),
+            ('A.item', 'start_map', None),
+            ('A.item', 'map_key', 'C'),
+            ('A.item.C', 'null', None),
+            ('A.item', 'end_map', None),
+            ('A', 'end_array', None),
+            ('', 'map_key', 'D'),
+            ('D', 'start_map', None),
+            ('D', 'map_key', 'E'),
+            ('D.E', 'boolean', True),
+            ('D', 'end_map', None),
+            ('', 'end_map', None)
+        ])
+        with open('test_1.json') as f:
+            urls = [value for path, event, value in iterparse(f, chunk_size=16) if path == 'URL2.item']
+        with open('test_1.json') as f:
+            self.assertEqual(urls, parse(f.read())['URL2'])
+        source = '{"\u00e9": ["\U0001f600", 1]}'
+        self.assertEqual(list(iterparse(io.BytesIO(source.encode()), chunk_size=1)),
+                         list(iterparse(source)))
+        self.assertRaises(JSONSyntaxError, list, iterparse(io.BytesIO(b'["\xc3\xa9')))
+
+    def test_parse_lazy(self):
+        with open('test_1.json') as f:
+            source = f.read()
+        document = parse_lazy(source)
+        self.assertIsInstance(document, JSONObject)
+        self.assertIsInstance(document['Py']['CPython'], JSONArray)
+        self.assertEqual(document['Py']['CPython'][2]['PYTHON'], 'I LOVE IT')
+        self.assertEqual(document['URL2'][-1], parse(source)['URL2'][-1])
+        self.assertEqual(len(document), 10)
+        self.assertEqual(document.to_python(), parse(source))
+        self.assertEqual(document['Py'].to_python(), parse(source)['Py'])
+        self.assertEqual(parse_lazy('[1, {"A\\"": "B\\"]"}, "C"]')[1]['A"'], 'B"]')
+        with self.assertRaises(JSONSyntaxError):
+            parse_lazy('{"A": [1, 2}')['A']
+        with self.assertRaises(JSONSyntaxError):
+            parse_lazy('{"A": "BC}')['A']
+        with self.assertRaises(JSONSyntaxError):
+            parse_lazy('["X]')[0]
+        self.assertRaises(JSONSyntaxError, extract, '{"A": "}', ['$.A'])
+        self.assertEqual(parse_lazy('["", "X"]').to_python(), ['', 'X'])
+
+    def test_structural_index(self):
+        source = '{"A\\"": [1, "B\\\\", {"C": "{,:]"}]}'
+        self.assertEqual([source[i] for i in build_index(source)],
+                         list('{"":[,"",{"":""}]}'))
+        self.assertEqual(list(build_index(source)), [0, 1, 5, 6, 8, 10, 12, 16, 17, 19, 20, 22, 23, 25, 30, 31, 32, 33])
+        for name in ('test_1.json', 'test_2.json'):
+            with open(name) as f:
+                source = f.read()
+            self.assertEqual(Parser(source, use_index=True).parse(), parse(source))
+        with self.assertRaises(JSONSyntaxError) as context:
+            Parser('{"A": 1,\n "B": tru}', use_index=True).parse()
+        self.assertEqual(context.exception.msg,
+                         'Error parsing *}* at line 2, column 10: Unknown identifier *tru*')
+
+    def test_extract(self):
+        with open('test_1.json') as f:
+            source = f.read()
+        self.assertEqual(extract(source, ['$.Py.CPython[2].PYTHON', '$.URL2[*]', '$.Py.CPython[-1].set[0]',
+                                          "$['NInt']", '$.Missing']), {
+            '$.Py.CPython[2].PYTHON': ['I LOVE IT'],
+            '$.URL2[*]': parse(source)['URL2'],
+            '$.Py.CPython[-1].set[0]': [True],
+            "$['NInt']": [-16],
+            '$.Missing': []
+        })
+        self.assertEqual(extract(source, ['$.Py.*'])['$.Py.*'], list(parse(source)['Py'].values()))
+        with self.assertRaises(ValueError):
+            extract(source, ['Py.CPython'])
+
+    def test_iter_serialise(self):
+        with open('test_1.json') as f:
+            test_1_json = parse(f.read())
+        chunks = list(iter_serialise(test_1_json, chunk_size=16))
+        self.assertTrue(all(len(chunk) == 16 for chunk in chunks[:-1]))
+        self.assertEqual(''.join(chunks), serialise(test_1_json))
+        self.assertEqual(parse(''.join(chunks)), test_1_json)
+        output = io.StringIO()
+        dump({'A"': [True, None, {'B': False}, []]}, output, chunk_size=4)
+        self.assertEqual(output.getvalue(), '{"A\\"": [true, null, {"B": false}, []]}')
+        self.assertEqual(''.join(iter_serialise(Parser(serialise(test_1_json)).parse(build_tree=True))),
+                         serialise(test_1_json))
+
+    def test_serialise_direct(self):
+        with open('test_1.json') as f:
+            test_1_json = parse(f.read())
+        for python_dict_or_list in [test_1_json, [{}, 1, [[]], {'A': {}}, -0.5, 'B"'], {'A': [[], {}]}]:
+            self.assertEqual(serialise(python_dict_or_list), Parser.from_python(python_dict_or_list).__str__())
+        self.assertRaises(TypeError, serialise, {1: 'A'})
+
+    def test_escapes(self):
+        source = r'{"A\"\\": ["\/\b\f\n\r\t", "\u00e9\ud83d\ude00", "\ud800"]}'
+        expected = {'A"\\': ['/\b\f\n\r\t', 'é😀', '\ud800']}
+        self.assertEqual(parse(source), expected)
+        self.assertEqual(parse(source.encode('utf-8')), expected)
+        self.assertEqual(Parser(source, use_index=True).parse(), expected)
+        self.assertEqual(parse_lazy(source).to_python(), expected)
+        parser = IncrementalParser()
+        for char in source:
+            parser.feed(char)
+        self.assertEqual(parser.close(), expected)
+        self.assertRaises(JSONSyntaxError, parse, r'["\x"]')
+        self.assertRaises(JSONSyntaxError, parse, r'["\u12"]')
+        self.assertEqual(serialise(expected), r'{"A\"\\": ["/\b\f\n\r\t", "é😀", "' + '\ud800"]}')
+        self.assertEqual(serialise(expected, ensure_ascii=True),
+                         r'{"A\"\\": ["/\b\f\n\r\t", "\u00e9\ud83d\ude00", "\ud800"]}')
+        self.assertEqual(''.join(iter_serialise(expected, chunk_size=3, ensure_ascii=True)),
+                         serialise(expected, ensure_ascii=True))
+        self.assertEqual(str(Parser.from_python(expected)), serialise(expected))
+        self.assertEqual(parse(serialise(['\x00\x1f\u2028'])), ['\x00\x1f\u2028'])
+
+    def test_json_lines(self):
+        records = [{'A': n, 'B': ['C"', None, True]} for n in range(200)] + [[]]
+        output = io.StringIO()
+        dump_lines(records, output, workers=2, batch_size=7)
+        self.assertEqual(output.getvalue().count('\n'), len(records))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.jsonl')
+            with open(path, 'w') as f:
+                f.write(output.getvalue() + '\n\n')
+            self.assertEqual(parse_lines(path, workers=2, block_size=100), records)
+            self.assertEqual(parse_lines(path, workers=1), records)
+            with open(path, 'a') as f:
+                f.write('{"A"}\n')
+            with self.assertRaises(JSONSyntaxError) as context:
+                parse_lines(path, workers=2, block_size=100)
+            self.assertIn('at line %d, column 5' % (len(records) + 3), context.exception.msg)
+        unordered = list(iter_lines(io.BytesIO(output.getvalue().encode()), workers=2, block_size=100))
+        self.assertEqual(sorted(map(serialise, unordered)), sorted(map(serialise, records)))
+        with self.assertRaises(JSONSyntaxError) as context:
+            parse_lines(io.StringIO('{"A": 1}\n{"A": 2}\n{"A"}\n'), workers=2, block_size=4)
+        self.assertIn('at line 3, column 5', context.exception.msg)
+
+    def test_parse_file(self):
+        with open('test_1.json') as f:
+            test_1_json = parse(f.read())
+        self.assertEqual(parse_file('test_1.json'), test_1_json)
+        self.assertEqual(parse_file('test_1.json', mmap=False), test_1_json)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{"\u00e9\u4e2d": ["\U0001f600\\"", 1.5],\n "B":\ttrue}')
+            self.assertEqual(parse_file(path), {'\u00e9\u4e2d': ['\U0001f600"', 1.5], 'B': True})
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{"\u00e9\u4e2d": [1],\n "\u00e9": x}')
+            with self.assertRaises(JSONSyntaxError) as error:
+                parse_file(path)
+            self.assertIn('line 2, column 8', error.exception.msg)
+            open(path, 'w').close()
+            self.assertRaises(JSONSyntaxError, parse_file, path)
+
+    def test_parse_bytes(self):
+        with open('test_1.json', 'rb') as f:
+            source = f.read()
+        test_1_json = parse(source.decode('utf-8'))
+        for source in [source, bytearray(source), memoryview(source)]:
+            self.assertEqual(parse(source), test_1_json)
+            self.assertEqual(Parser(source, use_index=True).parse(), test_1_json)
+        source = '[\n  "\u00e9\u4e2d\\"",\n  "\U0001f600", x]'
+        self.assertEqual(build_index(source.encode('utf-8')), build_index(source.encode('utf-8').decode('latin-1')))
+        for use_index in [False, True]:
+            with self.assertRaises(JSONSyntaxError) as error:
+                Parser(memoryview(source.encode('utf-8')), use_index=use_index).parse()
+            self.assertIn('line 3, column 9', error.exception.msg)
+        self.assertRaises(JSONSyntaxError, parse, b'["\xff"]')
+
+    def test_intern_table(self):
+        source = '[{"Status": "OK", "N": 1000, "F": [1.5, -0.0]}, {"Status": "OK", "N": 1000, "F": [1.5, 0.0]}]'
+        table = InternTable()
+        first, second = parse(source, intern_table=table)
+        self.assertEqual([first, second], parse(source))
+        self.assertIs(list(first)[0], list(second)[0])
+        self.assertIs(first['Status'], second['Status'])
+        self.assertIs(first['N'], second['N'])
+        self.assertIsNot(first['F'], second['F'])
+        self.assertGreater(table.hits, 0)
+        self.assertGreater(table.saved_bytes, 0)
+        table = InternTable(share_subtrees=True)
+        first, second, third = parse('[[1, true, "A"], [1, true, "A"], [1, 1, "A"]]', intern_table=table)
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        table = InternTable(max_size=1)
+        parse('{"A": "B", "C": "B"}', intern_table=table)
+        self.assertEqual(len(table), 1)
+        table = InternTable()
+        self.assertEqual(parse('[Infinity, NaN, 1]', allow_inf=True, allow_nan=True, convert_nan_to=0.0,
+                               intern_table=table), [float('inf'), 0.0, 1])
+        self.assertEqual(parse('[NaN, 1]', allow_nan=True, convert_nan_to=None, intern_table=table), [None, 1])
+        self.assertRaises(JSONSyntaxError, parse, '[Infinity]', intern_table=table)
+        self.assertRaises(JSONSyntaxError, parse, '[NaN]', intern_table=table)
+
+    def test_numeric_arrays(self):
+        source = '{"A": [1.5, -2e3, 0], "B": [1, 2], "C": [1, "2", [3]], "D": [], "E": [NaN]}'
+        parsed = parse(source, allow_nan=True, numeric_arrays='array')
+        self.assertEqual(parsed['A'], array('d', [1.5, -2000.0, 0.0]))
+        self.assertEqual(parsed['B'], array('q', [1, 2]))
+        self.assertEqual(parsed['C'], [1, '2', array('q', [3])])
+        self.assertEqual(parsed['D'], [])
+        self.assertIsInstance(parsed['E'], list)
+        del parsed['E']
+        self.assertEqual(serialise(parsed), '{"A": [1.5, -2000.0, 0.0], "B": [1, 2], "C": [1, "2", [3]], "D": []}')
+        self.assertEqual(parse(b'[1, 12345678901234567890]', numeric_arrays='array'), [1, 12345678901234567890])
+        self.assertRaises(ValueError, parse, '[1]', numeric_arrays='list')
+        self.assertRaises(ValueError, Parser('[1]', numeric_arrays='array').parse, build_tree=True)
+        if numpy is not None:
+            parsed = parse(source, allow_nan=True, numeric_arrays='numpy')
+            self.assertEqual(parsed['A'].dtype, numpy.float64)
+            self.assertEqual(parsed['B'].tolist(), [1, 2])
+            self.assertEqual(serialise(parsed['C']), '[1, "2", [3]]')
+
+    def test_instrument(self):
+        source = '{"A": [1, "B", true, {"C": null}], "D": [1.5, 2]}'
+        parser = Parser(source, instrument=True)
+        self.assertEqual(parser.parse(), parse(source))
+        stats = parser.stats
+        self.assertEqual(stats.tokens, {'key': 3, 'string': 1, 'number': 3, 'literal': 2, 'object': 2, 'array': 2,
+                                        'numeric_array': 0})
+        self.assertEqual(stats.containers, 4)
+        self.assertEqual(stats.consumed, len(source))
+        self.assertEqual(stats.transitions['OBJECT_INITIAL'], 2)
+        self.assertEqual(stats.transitions['ARRAY_IDENTIFIER'], 4)
+        self.assertEqual(Parser(source).stats, None)
+        called = []
+        stats = ParseStats()
+        parse(source, numeric_arrays='array', instrument=called.append)
+        parse(source.encode('utf-8'), instrument=stats)
+        parse(source, instrument=stats)
+        self.assertEqual(called[0].tokens['numeric_array'], 1)
+        self.assertEqual(stats.consumed, 2 * len(source))
+        serialise(parse(source), stats=stats)
+        self.assertGreater(stats.timings['serialise'], 0)
+
+    def test_parse_in_parallel(self):
+        source = ' [1, "],[", {"A": [2, 3]},[] ,4] '
+        ranges, end = split_array(source, 1, 1)
+        self.assertEqual([source[i:j] for i, j in ranges], ['1', ' "],["', ' {"A": [2, 3]}', '[] ', '4'])
+        self.assertEqual(end, len(source) - 1)
+        self.assertEqual([source[i:j] for i, j in split_array(source, 1, 9)[0]], ['1, "],[", {"A": [2, 3]}', '[] ,4'])
+        records = [{'A': n, 'B': ['C"', None, {'D': [n / 2]}]} for n in range(5000)]
+        source = serialise(records)
+        self.assertEqual(parse(source, workers=2), records)
+        self.assertEqual(parse('{"A": 1}', workers=2), {'A': 1})
+        self.assertRaises(JSONSyntaxError, parse, source[:-1] + ',,]', workers=2)
+        # ,, where the array is cut, at either of its commas
+        source = '[%s]' % ','.join(['1'] * 40001)
+        for pos in 65537, 65538:
+            with self.assertRaises(JSONSyntaxError) as context:
+                parse(source[:pos] + ',' + source[pos:], workers=2)
+            self.assertIn('Unknown identifier', context.exception.msg)
+
+    def test_async(self):
+        records = [{'A': n, 'B': ['Ж', None, {'D': [n / 2]}]} for n in range(500)]
+        data = serialise(records).encode('utf-8')
+
+        class Writer:
+            def __init__(self):
+                self.data = bytearray()
+                self.drained = 0
+
+            def write(self, chunk):
+                self.data += chunk
+
+            async def drain(self):
+                self.drained += 1
+
+        async def chunks():
+            for i in range(0, len(data), 7):
+                yield data[i:i + 7]
+
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            self.assertEqual(await parse_async(reader, chunk_size=5, slice_size=3), records)
+            events = [event async for event in iterparse_async(chunks())]
+            self.assertEqual(events, list(iterparse(data.decode('utf-8'))))
+            writer = Writer()
+            await dump_async(records, writer, chunk_size=100)
+            self.assertEqual(writer.data, data)
+            self.assertGreater(writer.drained, 1)
+
+        asyncio.run(run())
+
+    def test_parse_cache(self):
+        source = '{"A": [1, {"B": null}], "C": "D"}'
+        cache = ParseCache(max_entries=2)
+        first = parse(source, cache=cache)
+        first['A'][1]['B'] = 2
+        self.assertEqual(parse(source, cache=cache), {'A': [1, {'B': None}], 'C': 'D'})
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(parse(source, allow_nan=True, cache=cache), parse(source))
+        self.assertEqual(parse(source.encode('utf-8'), cache=cache), parse(source))
+        self.assertEqual((len(cache), cache.hits, cache.evictions), (2, 2, 0))
+        parse("[]", cache=cache)
+        self.assertEqual((len(cache), cache.misses, cache.evictions), (2, 3, 1))
+        cache = ParseCache(mode=VIEW, max_bytes=len(source))
+        view = parse(source, cache=cache)
+        self.assertIs(parse(source, cache=cache), view)
+        self.assertEqual(view['A'], (1, {'B': None}))
+        self.assertRaises(TypeError, operator.setitem, view, 'C', 1)
+        parse(source + ' ', cache=cache)
+        self.assertEqual((len(cache), cache.size_bytes, cache.evictions), (1, len(source), 0))
+
+    def test_compile_schema(self):
+        parser = compile_schema({'A': 'int', 'B': ['float'], 'C': {'D': 'string?', 'E': 'any'}, 'F': 'bool'})
+        self.assertIs(compile_schema({'A': 'int', 'B': ['float'], 'C': {'D': 'string?', 'E': 'any'}, 'F': 'bool'})
+                      .source, parser.source)
+        expected = {'A': 1, 'B': [2.0, 3.5], 'C': {'D': None, 'E': [{'G': 'H'}]}, 'F': True}
+        self.assertEqual(parser.parse(' {"A": 1, "B": [2, 3.5], "C": {"D": null, "E": [{"G": "H"}]}, "F": true}'),
+                         expected)
+        self.assertEqual(parser.fallbacks, 0)
+        self.assertEqual(parser.parse(b'{"F": true, "C": {"E": [{"G": "H"}], "D": null}, "B": [2, 3.5], "A": 1}'),
+                         expected)
+        self.assertEqual(parser.fallbacks, 1)
+        self.assertRaises(JSONSchemaError, parser.parse, '{"A": 1.5, "B": [], "C": {"D": null, "E": 1}, "F": true}')
+        self.assertRaises(JSONSchemaError, parser.parse, '{"A": 1, "B": [], "C": {"D": null, "E": 1}}')
+        self.assertRaises(JSONSchemaError, parser.parse, '{"A": 1, "B": [], "C": {"D": null, "E": 1}, "F": true, '
+                                                         '"G": 1}')
+        self.assertRaises(JSONSyntaxError, parser.parse, '{"A": 1, "B": [')
+        self.assertEqual(compile_schema(['number']).parse('[1, 2.5, 3e2]'), [1, 2.5, 300.0])
+        self.assertRaises(ValueError, compile_schema, 'int')
+
+    def test_parse_document(self):
+        source = '{"A": [1, {"B": "C"}, [2]], "D": {"E": null}}'
+        document = parse_document(source)
+        self.assertEqual(document.root, parse(source))
+        self.assertEqual(document.span('A', 1), (10, 20))
+        self.assertEqual(document.span('A', -1, 0), (23, 24))
+        document.apply_edit(16, 19, '["F", 3]')
+        self.assertEqual(document.reparsed, len('{"B": ["F", 3]}'))
+        self.assertEqual(document.root, {'A': [1, {'B': ['F', 3]}, [2]], 'D': {'E': None}})
+        start, end = document.span('D', 'E')
+        self.assertEqual(document.source[start:end], 'null')
+        document.apply_edit(start, end, '4')
+        self.assertEqual(document.root, parse(document.source))
+        nested = document.root['A']
+        document.apply_edit(1, 4, '"G"')
+        self.assertEqual(document.root, {'G': [1, {'B': ['F', 3]}, [2]], 'D': {'E': 4}})
+        self.assertIs(document.root['G'], nested)
+        source = document.source
+        self.assertRaises(JSONSyntaxError, document.apply_edit, 5, 6, '{')
+        self.assertEqual(document.source, source)
+        document = parse_document('{"A": true, "1": []}')
+        source = document.source
+        self.assertRaises(JSONSyntaxError, document.apply_edit, 6, 10, '"')
+        self.assertRaises(JSONSyntaxError, document.apply_edit, 14, 15, '')
+        self.assertEqual(document.source, source)
+        self.assertEqual(document.root, {'A': True, '1': []})
+        # edits of a duplicated key not kept in the value
+        for source, start, end, new_text in ('{"A": [1], "A": [2], "B": [1, 2]}', 7, 8, '5'), \
+                                            ('{"A": [1], "B": 0, "A": [2]}', 7, 8, '9, 8'):
+            document = parse_document(source)
+            self.assertEqual(document.apply_edit(start, end, new_text), parse(document.source))
+            self.assertEqual(document.root, {'A': [2], 'B': parse(source)['B']})
+
+    def test_parse_limits(self):
+        source = '{"A": [1, "BC", [true]], "D": {"E": null}}'
+        limits = ParseLimits(max_depth=3, max_bytes=len(source), max_string_length=4, max_container_items=3,
+                             max_total_elements=8)
+        self.assertEqual(parse(source, limits=limits), parse(source))
+        self.assertEqual(parse(source.encode(), limits=limits, numeric_arrays='array'), parse(source))
+        for limit, value in [('max_depth', 2), ('max_bytes', len(source) - 1), ('max_string_length', 3),
+                             ('max_container_items', 2), ('max_total_elements', 7)]:
+            tighter = ParseLimits(**dict({'max_depth': 3, 'max_bytes': len(source), 'max_string_length': 4,
+                                          'max_container_items': 3, 'max_total_elements': 8}, **{limit: value}))
+            with self.assertRaises(JSONLimitError) as context:
+                parse(source, limits=tighter)
+            self.assertIn('Exceeded %s of %d' % (limit, value), context.exception.msg)
+        with self.assertRaises(JSONLimitError) as context:
+            parse('[1,\n [[2]]]', limits=ParseLimits(max_depth=2))
+        self.assertEqual(context.exception.msg, 'Error parsing *[* at line 2, column 3: Exceeded max_depth of 2')
+        self.assertRaises(JSONLimitError, parse, '[[1, 2, 3]]', numeric_arrays='array',
+                          limits=ParseLimits(max_container_items=2))
+        self.assertRaises(JSONLimitError, parse, '[12345]', limits=ParseLimits(max_string_length=4))
+        self.assertEqual(parse('[1    ,2]', limits=ParseLimits(max_string_length=1)), [1, 2])
+        self.assertRaises(ValueError, ParseLimits, max_depth=-1)
+
+        # the char pool is limited while the source is fed
+        parser = IncrementalParser(limits=ParseLimits(max_string_length=8))
+        parser.feed('["')
+        parser.feed('x' * 8)
+        self.assertRaises(JSONLimitError, parser.feed, 'x')
+        parser = IncrementalParser(limits=ParseLimits(max_bytes=4))
+        parser.feed('[1, ')
+        self.assertRaises(JSONLimitError, parser.feed, '2]')
+
 
 if __name__ == '__main__':
     unittest.main()